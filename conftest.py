@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from src.timetable import *
+
+data_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+@pytest.fixture(scope='session')
+def timetable_path() -> str:
+    return os.path.join(data_dir, '2학년 학생별 시간표.xlsx')
+
+@pytest.fixture(scope='session')
+def subject_path() -> str:
+    return os.path.join(data_dir, '과목별 다교사수업.xlsx')
+
+@pytest.fixture
+def make_classes():
+    """
+    `pool`에 김선생의 미적분학I(4시수, 1분반)과 일반물리학I(3시수, 2분반) 수업을 만들어 돌려주는 함수입니다.
+    """
+
+    def make(pool: ClassPool, classroom: str = '본 101') -> tuple[Class, Class]:
+        teacher = pool.intern_teacher('김선생', classroom)
+        math = pool.intern_class(pool.intern_subject('미적분학I', 4, 1, (teacher,)), teacher)
+        physics = pool.intern_class(pool.intern_subject('일반물리학I', 3, 2, (teacher,)), teacher)
+        return math, physics
+
+    return make
+
+@pytest.fixture
+def make_students(make_classes):
+    """
+    학번 -> 수업이 있는 (요일, 교시)들로 `학생{학번}`들의 `StudentList`를 만드는 함수입니다. 수업은 모두 미적분학I입니다.
+    """
+
+    def make(busy: dict[int, list[tuple[str, int]]]) -> StudentList:
+        pool = ClassPool()
+        math, _ = make_classes(pool)
+
+        students = []
+        for id, cells in busy.items():
+            timetable = Timetable(pool=pool)
+            for week, period in cells:
+                timetable[week, period] = math
+            students.append(Student(id, f'학생{id}', timetable, ClassSet(pool=pool)))
+        return StudentList(students)
+
+    return make
@@ -1,11 +1,11 @@
+import os
+import queue
+import threading
 import tkinter as tk
 from typing import Callable
 
-import pyautogui
 import sv_ttk
-from tkinter import ttk, filedialog
-from PIL import Image
-from openpyxl import load_workbook
+from tkinter import ttk, filedialog, messagebox
 
 from timetable import *
 
@@ -36,63 +36,233 @@ class ClassBlock(tk.Frame):
         )
         self.btn.pack(fill=tk.BOTH, expand=1, padx=border_size, pady=border_size)
 
-def capture(root: tk.Toplevel):
+def save_text(text: str, path: str):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+
+class TimetableCanvas(tk.Canvas):
     """
-    `root`의 스크린샷을 찍어 저장합니다. Windows 11에서는 탭이 둥근 사각형이기 때문에 이를 보정하기 위해
-    `left_mask`와 `right_mask`를 사용해 좌우 하단을 보정합니다.
+    시간표 전체를 캔버스 하나에 사각형과 글자로 그립니다. 칸마다 위젯을 만들지 않고, 누르기/놓기도 캔버스에 한 번만 바인딩해서
+    누른 좌표로 어느 수업인지 찾습니다. 위젯 하나라서 여러 학생의 시간표를 나란히 놓기도 쉽습니다.
     """
 
-    x, y, w, h = root.winfo_x(), root.winfo_y(), root.winfo_width(), root.winfo_height()
+    def __init__(self, parent, app: 'App'):
+        super().__init__(parent, width=app.period_width + len(Week) * app.default_width,
+                         height=app.week_height + (max_period - 1) * app.default_height,
+                         background='#fafafa', highlightthickness=0)
 
-    # 윈도우 타이틀바 높이와 캡처 오차 수동 보정
-    y += 57
-    x += 3
+        self.app = app
+        self.cells: dict[tuple[int, int], tuple[int, int, str, Class]] = {}  # (요일, 교시) -> (사각형, 글자, 과목 이름, 수업)
+        self.pressed: tuple[int, int, str, Class] | None = None
 
-    grabbed = pyautogui.screenshot(region=(x, y, w, h))
+        # 요일 행과 교시 열
+        font = ("Pretendard Variable", 11)
+        self.create_rectangle(0, 0, app.period_width, int(self['height']), fill='#eeeeee', width=0)
+        self.create_rectangle(0, 0, int(self['width']), app.week_height, fill='#eeeeee', width=0)
+        for i in range(1, max_period):
+            self.create_text(app.period_width // 2, app.week_height + (i - 0.5) * app.default_height, text=f'{i}',
+                             font=font)
+        for week in Week:
+            self.create_text(app.period_width + (week.value + 0.5) * app.default_width, app.week_height // 2,
+                             text=week.name, font=font)
+
+        self.bind('<ButtonPress>', self.on_press)
+        self.bind('<ButtonRelease>', self.on_release)
+
+    def draw(self, timetable: Timetable):
+        self.delete('block')
+        self.cells.clear()
+        self.pressed = None
+
+        border = 4  # ClassBlock의 테두리와 여백
+        for week, period, duration, subject in timetable.blocks():
+            x = self.app.period_width + week.value * self.app.default_width
+            y = self.app.week_height + (period - 1) * self.app.default_height
+            height = self.app.default_height * duration
+
+            label_txt = split(subject.super.name.replace(' ', ''), 5)
+            rect = self.create_rectangle(x + border, y + border, x + self.app.default_width - border, y + height - border,
+                                         fill=subject.super.type.color[0], width=0, tags='block')
+            text = self.create_text(x + self.app.default_width // 2, y + height // 2, text=label_txt, justify='left',
+                                    font=("Pretendard Variable", 11), tags='block')
+
+            for p in range(period, period + duration):
+                self.cells[week.value, p] = rect, text, label_txt, subject
+
+    def hit(self, x: int, y: int) -> tuple[int, int, str, Class] | None:
+        if x < self.app.period_width or y < self.app.week_height:
+            return None
+        week = (x - self.app.period_width) // self.app.default_width
+        period = (y - self.app.week_height) // self.app.default_height + 1
+        return self.cells.get((week, period))
+
+    # 수업을 누르면 강의 정보(선생님, 강의실, 분반)를 보여줌
+    def on_press(self, event):
+        self.pressed = self.hit(event.x, event.y)
+        if self.pressed is not None:
+            rect, text, _, got = self.pressed
+            self.itemconfigure(rect, fill=got.super.type.color[1])
+            self.itemconfigure(text, text=f'{got.teacher.name}T\n{got.teacher.classroom}\n{got.super.nth}분반')
+
+    # 놓으면 다시 강의 이름을 보여줌
+    def on_release(self, _):
+        if self.pressed is not None:
+            rect, text, label_txt, got = self.pressed
+            self.itemconfigure(rect, fill=got.super.type.color[0])
+            self.itemconfigure(text, text=label_txt)
+            self.pressed = None
+
+class TimetableView(tk.Toplevel):
+    """
+    학생 시간표 창입니다. 창과 `ClassBlock`들은 한 번만 만들고, 다른 학생을 보여줄 때는 글자, 색, 위치만 바꿔서 다시 씁니다.
+    창을 닫으면 없애지 않고 숨겨 두었다가 다음 검색 때 다시 띄웁니다. `canvas`면 위젯 대신 `TimetableCanvas` 하나에 그립니다.
+    """
 
-    left_mask = Image.new('RGB', (12, 12), '#eeeeee')
-    right_mask = Image.new('RGB', (12, 12), '#fafafa')
+    def __init__(self, app: 'App', canvas=False):
+        super().__init__(app.parent)
 
-    grabbed.paste(left_mask, (0, h - left_mask.height))
-    grabbed.paste(right_mask, (w - right_mask.width, h - right_mask.height))
+        self.app = app
+        self.student: Student | None = None
+        self.pool: list[ClassBlock] = []  # 수업 블록 풀, 앞에서부터 필요한 만큼만 화면에 올림
+        self.canvas = TimetableCanvas(self, app) if canvas else None
 
-    return grabbed
+        self.geometry(
+            f"{app.period_width + len(Week) * app.default_width}x{app.week_height + (max_period - 1) * app.default_height}")
+        self.resizable(False, False)
+        self.protocol('WM_DELETE_WINDOW', self.withdraw)
 
-def split(s, chuck_size=5):
-    """
-    문자열 `s`를 `chunk_size` 길이로 나눕니다. 다만, 영어로 된 문자열은 `chunk_size` 길이에서 고려되지 않고 더해집니다.
-    '일반물리학II' 같은 문자열이 `chunk_size`가 5라면 '일반물리학\nII'로 나누어지는 것을 방지하기 위함입니다.
-    """
+        menubar = tk.Menu(self)
+        menubar.add_command(label="Screenshot", command=self.save_image)
+        menubar.add_command(label="Google Calendar", command=lambda: self.ask_save(self.student.get_google_cal(), 'csv', lambda x, f: x.to_csv(f)))
+        menubar.add_command(label="iCalendar", command=lambda: self.ask_save(self.student.get_ics(), 'ics', save_text))
+        self.configure(menu=menubar)
 
-    result = ""
-    count = 0
+        if self.canvas is not None:
+            self.canvas.place(x=0, y=0)
+            return
 
-    for char in s:
-        if re.match(r'[ㄱ-ㅎㅏ-ㅣ가-힣]', char):
-            count += 1
-            if count == chuck_size + 1:
-                result += '\n'
-                count = 0
+        # 요일 행과 교시 열 사이 빈틈 마스크 생성
+        block1 = ClassBlock(self, width=app.period_width, height=app.week_height, border_size=0)
+        block1.place(x=-4, y=0)
+        block2 = ClassBlock(self, width=app.period_width, height=app.week_height, border_size=0)
+        block2.place(x=0, y=-4)
 
-        result += char
+        # 교시 열 생성
+        for i in range(1, max_period):
+            period_block = ClassBlock(self, text=f'{i}', width=app.period_width, height=app.default_height, border_size=0)
+            period_block.place(x=-4, y=app.week_height + (i - 1) * app.default_height)
 
-    return result.strip('\n')
+        # 요일 행 생성
+        for week in Week:
+            week_block = ClassBlock(self, text=week.name, width=app.default_width, height=app.week_height, border_size=0)
+            week_block.place(x=app.period_width + week.value * app.default_width, y=-4)
+
+    def ask_save(self, obj, filetype: str, save_func: Callable[[..., str], None]):
+        filename = f"{self.student}의 시간표.{filetype}"
+
+        try:
+            file = filedialog.asksaveasfilename(
+                initialfile=filename,
+                defaultextension=filetype,
+                filetypes=[(f"{filetype.upper()} 파일", f'*.{filetype}')],
+                initialdir='C:/Users/USER/Desktop',
+                title='시간표 저장'
+            )
+
+            if file is None:
+                return
+
+            save_func(obj, file)
+        except:
+            return
+
+    def save_image(self):
+        # 한글 글꼴이 없으면 그림을 그리지 못하므로 저장 창을 띄우기 전에 알림
+        try:
+            image = self.student.get_image()
+        except OSError as e:
+            messagebox.showerror('시간표 저장', str(e), parent=self)
+            return
+
+        self.ask_save(image, 'png', lambda x, f: x.save(f))
+
+    def new_block(self) -> ClassBlock:
+        class_block = ClassBlock(self, width=self.app.default_width, height=self.app.default_height,
+                                 label_txt='', subject=None)
+
+        # class block을 누르면 강의 정보(선생님, 강의실, 분반)를 보여줌
+        def on_class_block_press(event):
+            source: Button = event.widget
+            got: Class = source.memo['subject']
+
+            source.configure(
+                text=f'{got.teacher.name}T\n{got.teacher.classroom}\n{got.super.nth}분반')
+        class_block.btn.bind('<ButtonPress>', on_class_block_press)
+
+        # class block을 놓으면 다시 강의 이름을 보여줌
+        def on_class_block_release(event):
+            source: Button = event.widget
+            got = source.memo['label_txt']
+
+            source.configure(text=got)
+        class_block.btn.bind('<ButtonRelease>', on_class_block_release)
+
+        return class_block
+
+    def show(self, student: Student):
+        self.student = student
+        self.title(f"{student}의 시간표")
+
+        if self.canvas is not None:
+            self.canvas.draw(student.timetable)
+            self.deiconify()
+            self.lift()
+            return
+
+        # 시간표 생성 (연강은 한 블록으로), 모자란 블록만 새로 만듦
+        used = 0
+        for week, period, duration, subject in student.timetable.blocks():
+            if used == len(self.pool):
+                self.pool.append(self.new_block())
+            class_block = self.pool[used]
+            used += 1
+
+            label_txt = split(subject.super.name.replace(' ', ''), 5)
+            class_block.btn.memo.update(label_txt=label_txt, subject=subject)
+            class_block.btn.configure(text=label_txt, bg=subject.super.type.color[0],
+                                      activebackground=subject.super.type.color[1])
+            class_block.configure(height=self.app.default_height * duration)
+            class_block.place(x=self.app.period_width + week.value * self.app.default_width,
+                              y=self.app.week_height + (period - 1) * self.app.default_height)
+
+        # 남는 블록은 숨겨 둠
+        for class_block in self.pool[used:]:
+            class_block.place_forget()
+
+        self.deiconify()
+        self.lift()
 
 class App(ttk.Frame):
-    def __init__(self, parent: tk.Tk):
+    def __init__(self, parent: tk.Tk, canvas=False):
         super().__init__()
 
         self.parent = parent
+        self.canvas = canvas  # 시간표를 위젯 대신 캔버스 하나에 그릴지
         self.parent_width = 300
         self.parent.geometry(f"{self.parent_width}x170")
 
-        self.period_width = 45
-        self.default_width = 125
+        self.period_width = period_width
+        self.default_width = default_width
 
-        self.week_height = 50
-        self.default_height = 70
+        self.week_height = week_height
+        self.default_height = default_height
 
         self.students = None
+        self.view: TimetableView | None = None  # 시간표 창, 한 번 만들어서 계속 씀
+        self.suggestions: tk.Toplevel | None = None  # 자동 완성 목록 창
+        self.suggestion_list: tk.Listbox | None = None
+        self.matches: list[Student] = []  # 자동 완성 목록에 보이는 학생들
+        self.loading: threading.Event | None = None  # 불러오는 중인 작업의 취소 신호
 
         self.title_screen()
 
@@ -118,29 +288,143 @@ class App(ttk.Frame):
 
         if len(f) != 2:
             return
-        else:
-            button.configure(text='Loading...', state='disabled')
 
-        # 2개의 파일에서 자동으로 timetable 파일과 subject 파일을 구분
-        wb = load_workbook(f[0], read_only=True)
-        if '2학기 강의실' in wb.sheetnames:
+        # 불러오는 중에 다른 파일을 고르면 이전 작업은 취소함
+        if self.loading is not None:
+            self.loading.set()
+
+        button.configure(text='Loading...')
+        warn.configure(text='')
+
+        # 2개의 파일에서 자동으로 timetable 파일과 subject 파일을 구분, 'n학기 강의실' 시트가 있는 쪽이 subject 파일
+        semesters = StudentList.semesters(f[0])
+        if semesters:
             subject_path = f[0]
             timetable_path = f[1]
         else:
             subject_path = f[1]
             timetable_path = f[0]
+            semesters = StudentList.semesters(subject_path)
+
+        # 가장 최근 학기, 학년은 '2학년 학생별 시간표.xlsx' 같은 파일 이름에서 읽음
+        semester = max(semesters, default=2)
+        matched = re.search(r'(\d)학년', os.path.basename(timetable_path))
+        grade = int(matched.group(1)) if matched is not None else 2
+
+        # 진행 막대
+        progress_bar = ttk.Progressbar(self, mode='determinate', length=200)
+        progress_bar.place(x=self.parent_width // 2, y=145, anchor='center')
+
+        # 학생 목록은 다른 스레드에서 불러오고, 결과는 큐로 받음
+        cancel = threading.Event()
+        results = queue.Queue()
+        self.loading = cancel
+
+        def load():
+            try:
+                students = StudentList.load(timetable_path, subject_path, cache_dir=default_cache_dir, lazy=True,
+                                            progress=lambda done, total: results.put(('progress', done, total)),
+                                            cancel=cancel, grade=grade, semester=semester)
+                students.search('')  # 검색 색인은 여기서 미리 만들어 둠
+                results.put(('done', students))
+            except LoadCancelled:
+                pass
+            except Exception as e:
+                results.put(('error', e))
+
+        threading.Thread(target=load, daemon=True).start()
+        self.after(50, lambda: self.poll_loading(cancel, results, progress_bar, button, warn))
+
+    def poll_loading(self, cancel: threading.Event, results: queue.Queue, progress_bar: ttk.Progressbar,
+                     button: ttk.Button, warn: ttk.Label):
+        # 다른 파일을 골라서 취소된 작업
+        if cancel.is_set():
+            progress_bar.destroy()
+            return
+
+        try:
+            while True:
+                kind, *args = results.get_nowait()
+
+                if kind == 'progress':
+                    done, total = args
+                    progress_bar.configure(maximum=max(total or done, done), value=done)
+                elif kind == 'done':
+                    self.students = args[0]
+                    self.loading = None
+                    progress_bar.destroy()
+                    button.destroy()
+                    self.search_entry(warn)
+                    return
+                else:
+                    self.loading = None
+                    progress_bar.destroy()
+                    button.configure(text='Load Files')
+                    warn.configure(text='파일을 불러오지 못했습니다')
+                    return
+        except queue.Empty:
+            pass
 
-        # 학생 목록을 불러옴
-        self.students = StudentList.load(timetable_path, subject_path)
-        button.destroy()
+        self.after(50, lambda: self.poll_loading(cancel, results, progress_bar, button, warn))
 
+    def search_entry(self, warn: ttk.Label):
         # 검색용 엔트리 생성
         name_var = tk.StringVar(value='학번이나 이름을 입력하세요')  # 엔트리 플레이스홀더
         name_entry = ttk.Entry(self, textvariable=name_var)
         name_entry.bind('<Return>', lambda _: self.search_screen(name_var, warn))
         name_entry.bind('<Button-1>', lambda _: name_var.set(''))
+        name_entry.bind('<KeyRelease>', lambda e: self.autocomplete(e, name_var, name_entry, warn))
+        # 목록을 누르려고 엔트리를 떠난 게 아니면 목록을 닫음
+        name_entry.bind('<FocusOut>', lambda _: self.after(
+            200, lambda: self.parent.focus_get() is not self.suggestion_list and self.hide_suggestions()))
         name_entry.place(x=self.parent_width // 2, y=115, anchor='center')
 
+    def autocomplete(self, event, entry: tk.StringVar, entry_widget: ttk.Entry, warn: ttk.Label):
+        # 입력할 때마다 학번, 이름, 초성으로 시작하는 학생을 목록에 보여줌
+        if event.keysym in ('Return', 'Escape'):
+            self.hide_suggestions()
+            return
+        if event.keysym == 'Down' and self.matches:
+            self.suggestion_list.focus_set()
+            self.suggestion_list.selection_set(0)
+            return
+
+        text = entry.get().strip()
+        self.matches = self.students.search(text, limit=8) if text else []
+        if not self.matches:
+            self.hide_suggestions()
+            return
+
+        if self.suggestions is None or not self.suggestions.winfo_exists():
+            self.suggestions = tk.Toplevel(self.parent)
+            self.suggestions.overrideredirect(True)
+            self.suggestion_list = tk.Listbox(self.suggestions, font=("Pretendard Variable", 10), activestyle='none')
+            self.suggestion_list.pack(fill='both', expand=True)
+
+            def choose(_):
+                selected = self.suggestion_list.curselection()
+                if selected:
+                    entry.set(str(self.matches[selected[0]].id))
+                    self.hide_suggestions()
+                    self.search_screen(entry, warn)
+            self.suggestion_list.bind('<ButtonRelease-1>', choose)
+            self.suggestion_list.bind('<Return>', choose)
+            self.suggestion_list.bind('<Escape>', lambda _: self.hide_suggestions())
+
+        self.suggestion_list.delete(0, 'end')
+        for student in self.matches:
+            self.suggestion_list.insert('end', str(student))
+        self.suggestion_list.configure(height=len(self.matches))
+
+        self.suggestions.geometry(f"{entry_widget.winfo_width()}x{len(self.matches) * 20}"
+                                  f"+{entry_widget.winfo_rootx()}+{entry_widget.winfo_rooty() + entry_widget.winfo_height()}")
+        self.suggestions.deiconify()
+        self.suggestions.lift()
+
+    def hide_suggestions(self):
+        if self.suggestions is not None and self.suggestions.winfo_exists():
+            self.suggestions.withdraw()
+
     def search_screen(self, entry: tk.StringVar, warn: ttk.Label):
         name = entry.get().strip()
         if self.students is None:
@@ -151,104 +435,12 @@ class App(ttk.Frame):
         if self.students is not None and student is not None:
             warn.configure(text='')
 
-            new = tk.Toplevel(self.parent)
-            new.title(f"{student}의 시간표")
-            new.geometry(
-                f"{self.period_width + len(Week) * self.default_width}x{self.week_height + (max_period - 1) * self.default_height}")
-            new.resizable(False, False)
-
-            def ask_save(obj, filetype: str, save_func: Callable[[..., str], None]):
-                filename = f"{student}의 시간표.{filetype}"
-
-                try:
-                    file = filedialog.asksaveasfilename(
-                        initialfile=filename,
-                        defaultextension=filetype,
-                        filetypes=[(f"{filetype.upper()} 파일", f'*.{filetype}')],
-                        initialdir='C:/Users/USER/Desktop',
-                        title='시간표 저장'
-                    )
-
-                    if file is None:
-                        return
-
-                    save_func(obj, file)
-                except:
-                    return
-
-            menubar = tk.Menu(new)
-            menubar.add_command(label="Screenshot", command=lambda: ask_save(capture(new), 'png', lambda x, f: x.save(f)))
-            menubar.add_command(label="Google Calendar", command=lambda: ask_save(student.get_google_cal(), 'csv', lambda x, f: x.to_csv(f)))
-            new.configure(menu=menubar)
-
-            self.timetable_screen(new, student)
+            if self.view is None or not self.view.winfo_exists():
+                self.view = TimetableView(self, self.canvas)
+            self.view.show(student)
         else:
             warn.configure(text='학생을 찾을 수 없습니다')
 
-    def timetable_screen(self, new: tk.Toplevel, student: Student):
-        # 요일 행과 교시 열 사이 빈틈 마스크 생성
-        block1 = ClassBlock(new, width=self.period_width, height=self.week_height, border_size=0)
-        block1.place(x=-4, y=0)
-        block2 = ClassBlock(new, width=self.period_width, height=self.week_height, border_size=0)
-        block2.place(x=0, y=-4)
-
-        # 교시 열 생성
-        for i in range(1, max_period):
-            period_block = ClassBlock(new, text=f'{i}', width=self.period_width, height=self.default_height, border_size=0)
-            period_block.place(x=-4, y=self.week_height + (i - 1) * self.default_height)
-
-        # 요일 행 생성
-        for week in Week:
-            week_block = ClassBlock(new, text=week.name, width=self.default_width, height=self.week_height, border_size=0)
-            week_block.place(x=self.period_width + week.value * self.default_width, y=-4)
-
-        # 시간표 생성
-        for week in Week:
-            items = student.timetable[week].items()
-            start: tuple[int, Class] = None
-
-            for i, ((_, period), subject) in enumerate(items):
-                if start is None:
-                    start = period, subject
-
-                # 연강 여부 확인
-                if subject != start[1]:
-                    duration = period - start[0]  # n연강
-                else:
-                    continue
-
-                if start[1] == GAP:
-                    start = period, subject
-                    continue
-
-                # class block 생성
-                subject_name = start[1].super.name.replace(' ', '')
-                label_txt = split(subject_name, 5)
-                class_block = ClassBlock(new, width=self.default_width, height=self.default_height * duration,
-                                         text=label_txt, bg=start[1].super.type.color,
-                                         label_txt=label_txt, subject=start[1])
-                class_block.place(x=self.period_width + week.value * self.default_width,
-                                  y=self.week_height + (start[0] - 1) * self.default_height)
-
-                # class block을 누르면 강의 정보(선생님, 강의실, 분반)를 보여줌
-                def on_class_block_press(event):
-                    source: Button = event.widget
-                    got: Class = source.memo['subject']
-
-                    source.configure(
-                        text=f'{got.teacher.name}T\n{got.teacher.classroom}\n{got.super.nth}분반')
-                class_block.btn.bind('<ButtonPress>', on_class_block_press)
-
-                # class block을 놓으면 다시 강의 이름을 보여줌
-                def on_class_block_release(event):
-                    source: Button = event.widget
-                    got = source.memo['label_txt']
-
-                    source.configure(text=got)
-                class_block.btn.bind('<ButtonRelease>', on_class_block_release)
-
-                start = period, subject
-
 if __name__ == "__main__":
     root = tk.Tk()
 
@@ -1,9 +1,22 @@
+import hashlib
+import json
+import numpy as np
+import os
 import pandas as pd
+import pickle
 import re
-from datetime import date, time, timedelta, datetime
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from datetime import date, time, timedelta, datetime, timezone
 from math import *
+from typing import Callable
 from dataclasses import dataclass, field
 from enum import Enum
+from openpyxl import load_workbook
 
 times = [
     time(8, 50),
@@ -17,6 +30,142 @@ times = [
     time(17, 40)
 ]
 max_period = len(times)  # 최대 교시 수
+class_length = timedelta(minutes=50)  # 한 교시 수업 시간
+
+term_start = date(2023, 8, 14)  # 학기 첫 주 월요일
+term_end = date(2023, 12, 31)  # 이 날짜 전날까지 수업을 반복합니다
+
+google_cal_columns = ['Subject', 'Start Date', 'Start Time', 'End Date', 'End Time', 'All Day Event',
+                      'Description']  # , 'Location', 'Private']
+start_times = np.array([t.strftime("%I:%M %p") for t in times], dtype=object)  # 교시별 시작 시각 문자열
+end_times = np.array([(datetime.combine(datetime.min, t) + class_length).time().strftime("%I:%M %p")
+                      for t in times], dtype=object)  # 교시별 끝 시각 문자열
+
+ics_timezone = 'Asia/Seoul'
+ics_utc_offset = timedelta(hours=9)
+
+# 시간표 배치 (앱 창과 이미지가 같이 씀), 그림에는 1 ~ max_period - 1교시까지 나옴
+period_width = 45  # 교시 열 너비
+default_width = 125  # 요일 열 너비
+week_height = 50  # 요일 행 높이
+default_height = 70  # 교시 행 높이
+image_size = (period_width + 5 * default_width, week_height + (max_period - 1) * default_height)
+image_fonts = ['PretendardVariable.ttf', 'Pretendard-Regular.otf', 'malgun.ttf', 'AppleSDGothicNeo.ttc',
+               'AppleGothic.ttf', 'NanumGothic.ttf', 'NotoSansCJK-Regular.ttc', 'NotoSansKR-Regular.otf',
+               'UnDotum.ttf']  # 한글이 있는 글꼴 후보, 앞에서부터 찾아서 씀
+image_font_size = 15  # 앱의 11pt 글꼴과 비슷한 픽셀 크기
+
+loader_version = 5  # `StudentList.load` 결과 형식이 바뀌면 올려서 예전 캐시를 무시하게 함
+default_cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'timetable')
+
+def transform(x):
+    """
+    공백 제거해서 비교 손쉽게 만드는 함수입니다. 로마 숫자 기호도 알파벳으로 바꿉니다.
+    """
+
+    return x if pd.isna(x) else x.replace(' ', '').replace('Ⅳ', 'IV').replace('Ⅲ', 'III').replace(
+        'Ⅱ', 'II').replace('Ⅰ', 'I')
+
+choseong_table = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'  # 한글 음절의 초성 순서
+
+def choseong(s: str) -> str:
+    """
+    한글 음절을 초성으로 바꿉니다. '강산원' -> 'ㄱㅅㅇ', 한글 음절이 아닌 글자는 그대로 둡니다.
+    """
+
+    return ''.join(choseong_table[(ord(c) - 0xAC00) // 588] if '가' <= c <= '힣' else c for c in s)
+
+def split(s, chuck_size=5):
+    """
+    문자열 `s`를 `chunk_size` 길이로 나눕니다. 다만, 영어로 된 문자열은 `chunk_size` 길이에서 고려되지 않고 더해집니다.
+    '일반물리학II' 같은 문자열이 `chunk_size`가 5라면 '일반물리학\nII'로 나누어지는 것을 방지하기 위함입니다.
+    """
+
+    result = ""
+    count = 0
+
+    for char in s:
+        if re.match(r'[ㄱ-ㅎㅏ-ㅣ가-힣]', char):
+            count += 1
+            if count == chuck_size + 1:
+                result += '\n'
+                count = 0
+
+        result += char
+
+    return result.strip('\n')
+
+__fonts = threading.local()  # 스레드마다 따로 연 글꼴, FreeType 글꼴은 스레드 사이에 나눠 쓰지 않음
+
+def has_glyph(font, char: str) -> bool:
+    """
+    `font`에 `char` 글자 모양이 있는지 확인합니다. 없는 글자는 빈 네모(.notdef)로 그려지므로,
+    유니코드에 없는 글자를 그린 것과 같으면 없는 것으로 봅니다.
+    """
+
+    from PIL import Image, ImageDraw
+
+    def render(text: str) -> bytes:
+        image = Image.new('L', (font.size * 2, font.size * 2))
+        ImageDraw.Draw(image).text((0, 0), text, font=font, fill=255)
+        return image.tobytes()
+
+    return render(char) != render('\U0010FFFD')
+
+def image_font(path: str = None, size=image_font_size):
+    """
+    시간표 그림에 쓸 글꼴을 엽니다. 과목 이름을 그려야 하므로 한글('가')을 그릴 수 있는 글꼴만 씁니다.
+    `path`가 없으면 환경 변수 TIMETABLE_FONT, 그다음 `image_fonts`에서 처음 찾은 한글 글꼴을 씁니다.
+    한글 글꼴이 없는 서버에서는 한글 글꼴 파일 경로를 `path`로 넘기거나 TIMETABLE_FONT에 지정해야 하며,
+    쓸 수 있는 글꼴이 없으면 `OSError`가 납니다.
+    """
+
+    from PIL import ImageFont
+
+    fonts = getattr(__fonts, 'fonts', None)
+    if fonts is None:
+        fonts = __fonts.fonts = {}
+
+    if (path, size) not in fonts:
+        if path is not None:
+            candidates = [path]
+        else:
+            candidates = ([os.environ['TIMETABLE_FONT']] if 'TIMETABLE_FONT' in os.environ else []) + image_fonts
+
+        for candidate in candidates:
+            try:
+                font = ImageFont.truetype(candidate, size)
+            except OSError:
+                continue
+            if has_glyph(font, '가'):
+                fonts[path, size] = font
+                break
+        else:
+            raise OSError(f'한글을 그릴 수 있는 글꼴을 찾지 못했습니다: {", ".join(candidates)}. '
+                          f'한글 글꼴 파일 경로를 넘기거나 TIMETABLE_FONT 환경 변수에 지정해 주세요.')
+    return fonts[path, size]
+
+def ics_escape(text: str) -> str:
+    """
+    iCalendar 텍스트 값에서 특수문자(`\\`, `;`, `,`, 줄바꿈)를 이스케이프합니다.
+    """
+
+    return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+def ics_fold(line: str, limit=75) -> str:
+    """
+    iCalendar 한 줄이 UTF-8로 `limit` 바이트를 넘지 않도록 접습니다. 이어지는 줄은 공백 하나로 시작합니다.
+    """
+
+    folded, size = [], 0
+    for char in line:
+        width = len(char.encode('utf-8'))
+        if size + width > limit:
+            folded.append('\r\n ')
+            size = 1
+        folded.append(char)
+        size += width
+    return ''.join(folded)
 
 class Week(Enum):
     MON = 0
@@ -91,24 +240,117 @@ class SubjectType(Enum):
         else:  # 과학
             return '#D8E4F3', '#BCD1EA'  # 대충 하늘색
 
-@dataclass
-class Teacher:
+class CachedHash:
+    """
+    해시를 `_hash`에 캐시해 두는 클래스들의 부모 클래스입니다. 필드가 바뀌면 캐시를 지우고,
+    문자열 해시는 프로세스마다 다르므로 pickle할 때도 캐시를 저장하지 않습니다.
+    """
+
+    _hash: int = None
+
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+        if key != '_hash':
+            object.__setattr__(self, '_hash', None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_hash'] = None
+        return state
+
+# 과목 이름에 들어 있는 낱말 -> 과목 분류, 앞에 있는 분류가 우선
+subject_keywords: list[tuple[SubjectType, list[str]]] = [
+    (SubjectType.물리학, ['물리', '역학']),
+    (SubjectType.화학, ['화학']),
+    (SubjectType.생명과학, ['생명', '생물', '생리학', '생태']),
+    (SubjectType.지구과학, ['지구', '천문']),
+    (SubjectType.정보과학, ['딥러닝', '프로그래밍', '알고리즘']),
+    (SubjectType.수학, ['적분', '선형', '수학', '기하', '미분', '정수론']),
+    (SubjectType.예체능, ['음악', '미술', '체육', '건강']),
+    (SubjectType.인문, ['정치', '영작', '영어', '회화', '고전', '경제', '문학', '중국', '일본', '아시아', '독서', '작문']),
+]
+
+class SubjectClassifier:
+    """
+    과목 이름 -> `SubjectType` 분류기입니다. 분류표의 낱말들을 정규식 하나로 컴파일해 두고, 이름마다 결과를 캐시합니다.
+    분류표는 (분류, 낱말들) 목록이고 앞에 있는 분류가 우선이며, 어느 낱말도 없으면 `default`입니다.
+
+    classify('일반물리학I')
+    # SubjectType.물리학
+
+    classify.configure(SubjectClassifier.read_table('keywords.json'))
+    # {"물리학": ["물리", "역학"], ...} 형식의 파일로 분류표를 바꿈
+    """
+
+    def __init__(self, table: list[tuple[SubjectType, list[str]]], default: SubjectType = SubjectType.교양):
+        self.default = default
+        self.configure(table)
+
+    def configure(self, table: list[tuple[SubjectType, list[str]]]):
+        self.table = [(subject_type, list(keywords)) for subject_type, keywords in table]
+        self.__cache: dict[str, SubjectType] = {}
+
+        # 낱말 -> 우선순위, 같은 낱말이 여러 번 나오면 앞의 것
+        self.__priority: dict[str, int] = {}
+        for priority, (_, keywords) in enumerate(self.table):
+            for keyword in keywords:
+                self.__priority.setdefault(keyword, priority)
+
+        # 이름의 모든 위치에서 낱말을 찾도록 전방탐색으로 감싸고, 한 위치에서는 우선순위가 높은 낱말부터 시도함
+        alternation = '|'.join(map(re.escape, sorted(self.__priority, key=self.__priority.get)))
+        self.__pattern = re.compile(f'(?=({alternation}))') if alternation else None
+
+    def __call__(self, name: str) -> SubjectType:
+        if name not in self.__cache:
+            priorities = [] if self.__pattern is None else \
+                [self.__priority[matched.group(1)] for matched in self.__pattern.finditer(name)]
+            self.__cache[name] = self.table[min(priorities)][0] if priorities else self.default
+        return self.__cache[name]
+
+    def digest(self) -> str:
+        """
+        지금 분류표와 `default`의 해시입니다. 분류 결과가 pickle 캐시에 들어가므로 캐시 키에 섞어서, 분류표가 바뀌면 다시 해석하게 합니다.
+        """
+
+        table = [(subject_type.name, keywords) for subject_type, keywords in self.table]
+        return hashlib.sha256(json.dumps([self.default.name, table], ensure_ascii=False).encode()).hexdigest()
+
+    @staticmethod
+    def read_table(path: str) -> list[tuple[SubjectType, list[str]]]:
+        """
+        {"분류 이름": [낱말, ...], ...} 형식의 JSON 파일에서 분류표를 읽습니다. 적힌 순서가 우선순위입니다.
+        """
+
+        with open(path, encoding='utf-8') as f:
+            return [(SubjectType[subject_type], keywords) for subject_type, keywords in json.load(f).items()]
+
+# 환경 변수 TIMETABLE_SUBJECT_KEYWORDS로 분류표 파일을 지정하면 코드를 고치지 않고 분류를 바꿀 수 있음
+classify = SubjectClassifier(
+    SubjectClassifier.read_table(os.environ['TIMETABLE_SUBJECT_KEYWORDS'])
+    if 'TIMETABLE_SUBJECT_KEYWORDS' in os.environ else subject_keywords
+)
+
+@dataclass(eq=False)
+class Teacher(CachedHash):
     name: str
     classroom: str
 
     def __hash__(self):
-        return hash(self.name + '_' + self.classroom)
+        if self._hash is None:
+            self._hash = hash(self.name + '_' + self.classroom)
+        return self._hash
 
     def __eq__(self, other):
-        return isinstance(other, Teacher) and self.name == other.name and self.classroom == other.classroom
+        return self is other or \
+            isinstance(other, Teacher) and self.name == other.name and self.classroom == other.classroom
 
     def __repr__(self):
         return f'{self.name} ({self.classroom})'
 
     __str__ = __repr__
 
-@dataclass
-class Subject:
+@dataclass(eq=False)
+class Subject(CachedHash):
     name: str
     time: int  # 시수
     nth: int
@@ -116,33 +358,18 @@ class Subject:
     type: SubjectType = None
 
     def __post_init__(self):
-        if any(c in self.name for c in ['물리', '역학']):
-            self.type = SubjectType.물리학
-        elif any(c in self.name for c in ['화학']):
-            self.type = SubjectType.화학
-        elif any(c in self.name for c in ['생명', '생물', '생리학', '생태']):
-            self.type = SubjectType.생명과학
-        elif any(c in self.name for c in ['지구', '천문']):
-            self.type = SubjectType.지구과학
-        elif any(c in self.name for c in ['딥러닝', '프로그래밍', '알고리즘']):
-            self.type = SubjectType.정보과학
-        elif any(c in self.name for c in ['적분', '선형', '수학', '기하', '미분', '정수론']):
-            self.type = SubjectType.수학
-        elif any(c in self.name for c in ['음악', '미술', '체육', '건강']):
-            self.type = SubjectType.예체능
-        elif any(c in self.name for c in ['정치', '영작', '영어', '회화', '고전', '경제', '문학', '중국', '일본', '아시아', '독서', '작문']):
-            self.type = SubjectType.인문
-        else:
-            self.type = SubjectType.교양
+        self.type = classify(self.name)
 
     def subjects(self) -> list['Class']:
         return [Class(self, teacher) for teacher in self.teachers]
 
     def __hash__(self):
-        return hash((self.name, self.nth, self.time, self.teachers, self.type))
+        if self._hash is None:
+            self._hash = hash((self.name, self.nth, self.time, self.teachers, self.type))
+        return self._hash
 
     def __eq__(self, other):
-        return isinstance(other, Subject) and \
+        return self is other or isinstance(other, Subject) and \
             self.name == other.name and \
             self.nth == other.nth and \
             self.time == other.time and \
@@ -160,13 +387,19 @@ class Subject:
 
     __str__ = __repr__
 
-@dataclass
-class Class:
+@dataclass(eq=False)
+class Class(CachedHash):
     super: Subject
     teacher: Teacher = None
 
     def __hash__(self):
-        return hash((self.super, self.teacher))
+        if self._hash is None:
+            self._hash = hash((self.super, self.teacher))
+        return self._hash
+
+    def __eq__(self, other):
+        return self is other or \
+            isinstance(other, Class) and self.super == other.super and self.teacher == other.teacher
 
     def __repr__(self):
         return f'{self.super.name} {self.super.nth}반 ({self.teacher}T)'
@@ -176,86 +409,267 @@ class Class:
 GAP_ = Subject('공강', 0, 0)
 GAP = Class(GAP_)
 
+class ClassPool:
+    """
+    같은 교사, 같은 분반(과목 이름, 분반), 같은 (분반, 교사) 수업이 한 번만 만들어지도록 보관합니다.
+    학생마다 같은 객체를 공유하므로 메모리를 아끼고, 비교도 대부분 `is`로 끝납니다.
+    """
+
+    def __init__(self):
+        self.__teachers: dict[tuple[str, str], Teacher] = {}
+        self.__subjects: dict[tuple[str, int], Subject] = {}
+        self.__classes: dict[tuple[Subject, Teacher], Class] = {(GAP_, None): GAP}
+
+        # 수업 번호, 공강은 항상 0번
+        self.__ids: dict[Class, int] = {GAP: 0}
+        self.__by_id: list[Class] = [GAP]
+
+        # 분반 비트 번호와, 시수 -> 그 시수인 분반들의 비트 마스크
+        self.__section_ids: dict[Subject, int] = {}
+        self.__sections: list[Subject] = []
+        self.__time_masks: dict[int, int] = {}
+
+    def intern_teacher(self, name: str, classroom: str) -> Teacher:
+        key = name, classroom
+        if key not in self.__teachers:
+            self.__teachers[key] = Teacher(name, classroom)
+        return self.__teachers[key]
+
+    def intern_subject(self, name: str, time: int, nth: int, teachers: tuple[Teacher] = ()) -> Subject:
+        key = name, nth
+        if key not in self.__subjects:
+            self.__subjects[key] = Subject(name, time, nth, teachers)
+            self.section_id(self.__subjects[key])
+        return self.__subjects[key]
+
+    def intern_class(self, subject: Subject, teacher: Teacher = None) -> Class:
+        key = subject, teacher
+        if key not in self.__classes:
+            self.__classes[key] = Class(subject, teacher)
+            self.class_id(self.__classes[key])
+        return self.__classes[key]
+
+    def class_id(self, value: Class) -> int:
+        """
+        `value`의 수업 번호를 돌려줍니다. 처음 보는 수업이면 새 번호를 붙입니다.
+        """
+
+        if value not in self.__ids:
+            self.__ids[value] = len(self.__by_id)
+            self.__by_id.append(value)
+        return self.__ids[value]
+
+    def __getitem__(self, class_id: int) -> Class:
+        return self.__by_id[class_id]
+
+    def section_id(self, subject: Subject) -> int:
+        """
+        `subject`의 분반 비트 번호를 돌려줍니다. 처음 보는 분반이면 새 번호를 붙입니다.
+        """
+
+        if subject not in self.__section_ids:
+            index = len(self.__sections)
+            self.__section_ids[subject] = index
+            self.__sections.append(subject)
+            self.__time_masks[subject.time] = self.__time_masks.get(subject.time, 0) | (1 << index)
+        return self.__section_ids[subject]
+
+    def section(self, index: int) -> Subject:
+        return self.__sections[index]
+
+    def sections(self, bits: int):
+        """
+        비트 마스크 `bits`에 들어 있는 분반들을 비트 번호 순서로 돌려줍니다.
+        """
+
+        while bits:
+            lowest = bits & -bits
+            yield self.__sections[lowest.bit_length() - 1]
+            bits ^= lowest
+
+    def total_time(self, bits: int) -> int:
+        """
+        비트 마스크 `bits`에 들어 있는 분반들의 시수 합입니다. 시수별 마스크와 겹치는 비트 수만 세면 됩니다.
+        """
+
+        return sum(time * (bits & mask).bit_count() for time, mask in self.__time_masks.items())
+
+    def __len__(self):
+        return len(self.__by_id)
+
+    def __repr__(self) -> str:
+        return f'ClassPool({len(self.__teachers)}교사, {len(self.__subjects)}분반, {len(self.__classes)}수업)'
+
+    __str__ = __repr__
+
+default_pool = ClassPool()  # 따로 지정하지 않은 시간표들이 쓰는 수업 번호
+
+class TeacherSchedule:
+    """
+    다교사수업 시간표입니다. '3,4(2분반)', '3교시' 같은 문자열을 미리 한 번만 해석해서
+    (과목, 요일, 교시, 분반) -> 교사 를 바로 찾을 수 있게 만듭니다.
+
+    schedule = TeacherSchedule.from_index(StudentList.index_subjects(classroom_data, teacher_data))
+    schedule.get('미적분학I', '월', 3, 2)
+    # 월요일 3교시 미적분학I 2분반 교사
+    """
+
+    many_pattern = re.compile(r'(?P<periods>\d(?:,\d)*)\((?P<nth>\d)분반\)')  # 3,4(2분반)
+    single_pattern = re.compile(r'(?P<periods>\d(?:,\d)*)교시')  # 3,4교시, 분반이 하나일 때
+
+    def __init__(self):
+        # 분반이 None이면 모든 분반에 해당함, 값의 첫 번째는 먼저 적힌 순서
+        self.__content: dict[tuple[str, Week, int, int | None], tuple[int, Teacher]] = {}
+        self.__subjects: set[str] = set()
+
+    @staticmethod
+    def from_index(subject_index: dict[str, tuple[tuple[Teacher, ...], list[tuple[Teacher, tuple]]]]):
+        schedule = TeacherSchedule()
+        for subject, (_, schedule_rows) in subject_index.items():
+            for teacher, schedules in schedule_rows:
+                schedule.add(subject, teacher, schedules)
+
+        return schedule
+
+    def add(self, subject: str, teacher: Teacher, schedules: tuple):
+        """
+        `teacher`의 월~금 시간표 문자열 `schedules`를 해석해서 추가합니다.
+        같은 자리에 여러 교사가 있으면 먼저 추가된 교사가 우선입니다.
+        """
+
+        self.__subjects.add(subject)
+
+        for week, times in zip(Week, schedules):
+            if pd.isna(times):
+                continue
+
+            for sche in times.split('/'):
+                matched = self.many_pattern.match(sche)
+
+                if matched is None:
+                    matched = self.single_pattern.match(sche)
+                    if matched is None:
+                        raise ValueError(f'invalid schedule: {sche}')
+                    nth = None
+                else:
+                    nth = int(matched.group('nth'))
+
+                for period in map(int, matched.group('periods').split(',')):
+                    self.__content.setdefault((subject, week, period, nth), (len(self.__content), teacher))
+
+    def get(self, subject: str, week: Week | str, period: int, nth: int) -> Teacher | None:
+        week = Week.from_string(week)
+        candidates = [
+            found for found in (self.__content.get((subject, week, period, nth)),
+                                self.__content.get((subject, week, period, None)))
+            if found is not None
+        ]
+
+        return min(candidates)[1] if candidates else None
+
+    def __contains__(self, subject: str):
+        return subject in self.__subjects
+
+    def __len__(self):
+        return len(self.__content)
+
+    def __repr__(self) -> str:
+        return f'TeacherSchedule({len(self.__subjects)}과목, {len(self.__content)}칸)'
+
+    __str__ = __repr__
+
 class ClassSet:
-    def __init__(self, args=None):
+    """
+    분반들의 집합입니다. 각 분반은 `pool`의 비트 번호로 정수 하나에 저장되므로,
+    같은 `pool`끼리의 집합 연산은 비트 연산 한 번으로 끝납니다.
+    """
+
+    def __init__(self, args=None, pool: ClassPool = None):
+        if isinstance(args, ClassSet):
+            self.__pool = args.__pool
+            self.__bits = args.__bits
+            return
+
+        self.__pool = default_pool if pool is None else pool
+        self.__bits = 0
+
         if args is None:
-            self.__content: set[Subject] = set()
+            pass
         elif isinstance(args, set):
-            self.__content: set[Subject] = args
-        elif isinstance(args, ClassSet):
-            self.__content: set[Subject] = args.__content
+            self.add(*args)
         elif isinstance(args, Subject):
-            self.__content: set[Subject] = {args}
+            self.add(args)
         else:
             raise TypeError(f'unsupported operand type(s) for |: {type(self)} and {type(args)}')
 
-    def __len__(self):
-        return len(self.__content)
+    def __new(self, bits: int) -> 'ClassSet':
+        ret = ClassSet(pool=self.__pool)
+        ret.__bits = bits
+        return ret
 
-    def add(self, *args: Subject):
-        self.__content.add(*args)
+    def __operand(self, value: any, operator: str) -> int:
+        """
+        `value`를 이 집합의 `pool` 기준 비트 마스크로 바꿉니다.
+        """
 
-    def __or__(self, value: any):
         if isinstance(value, Student):
-            return ClassSet(self.__content | value.classes.__content)
-        elif isinstance(value, ClassSet):
-            return ClassSet(self.__content | value.__content)
+            value = value.classes
+
+        if isinstance(value, ClassSet):
+            if value.__pool is self.__pool:
+                return value.__bits
+            else:
+                return sum(1 << self.__pool.section_id(subject) for subject in value)
         elif isinstance(value, Subject):
-            return ClassSet(self.__content | {value})
+            return 1 << self.__pool.section_id(value)
+        elif isinstance(value, set):
+            return sum(1 << self.__pool.section_id(subject) for subject in value)
         else:
-            raise TypeError(f'unsupported operand type(s) for |: {type(self)} and {type(value)}')
+            raise TypeError(f'unsupported operand type(s) for {operator}: {type(self)} and {type(value)}')
+
+    def __len__(self):
+        return self.__bits.bit_count()
+
+    def add(self, *args: Subject):
+        for subject in args:
+            self.__bits |= 1 << self.__pool.section_id(subject)
+
+    def __or__(self, value: any):
+        return self.__new(self.__bits | self.__operand(value, '|'))
 
     def __and__(self, value: any):
-        if isinstance(value, Student):
-            return self & value.classes
-        elif isinstance(value, ClassSet):
-            return ClassSet(self.__content & value.__content)
-        elif isinstance(value, Subject):
-            return ClassSet(self.__content & {value})
-        else:
-            raise TypeError(f'unsupported operand type(s) for &: {type(self)} and {type(value)}')
+        return self.__new(self.__bits & self.__operand(value, '&'))
 
     def __xor__(self, value: any):
-        if isinstance(value, Student):
-            return ClassSet(self.__content ^ value.classes.__content)
-        elif isinstance(value, ClassSet):
-            return ClassSet(self.__content ^ value.__content)
-        elif isinstance(value, Subject):
-            return ClassSet(self.__content ^ {value})
-        else:
-            raise TypeError(f'unsupported operand type(s) for ^: {type(self)} and {type(value)}')
+        return self.__new(self.__bits ^ self.__operand(value, '^'))
 
     def __sub__(self, value: any):
-        if isinstance(value, Student):
-            return ClassSet(self.__content - value.classes.__content)
-        elif isinstance(value, ClassSet):
-            return ClassSet(self.__content - value.__content)
-        elif isinstance(value, Subject):
-            return ClassSet(self.__content - {value})
-        else:
-            raise TypeError(f'unsupported operand type(s) for -: {type(self)} and {type(value)}')
+        return self.__new(self.__bits & ~self.__operand(value, '-'))
 
     def __repr__(self) -> str:
         ret = '{\n'
-        for subject in self.__content:
+        for subject in self:
             ret += f'  {subject}\n'
-        ret += f'}} ({len(self.__content)}과목, {sum(map(lambda x: x.time, self.__content))}시수)'
+        ret += f'}} ({len(self)}과목, {self.total_time()}시수)'
 
         return ret
 
     def __iter__(self):
-        return iter(self.__content)
+        return self.__pool.sections(self.__bits)
 
     __str__ = __repr__
 
     def to_str(self) -> set[str]:
-        return set(map(str, self.__content))
+        return set(map(str, self))
 
     def to_time(self) -> list[int]:
-        return list(map(lambda x: x.time, self.__content))
+        return list(map(lambda x: x.time, self))
+
+    def total_time(self) -> int:
+        return self.__pool.total_time(self.__bits)
 
     def find(self, name: str, nth=None) -> Subject | None:
-        for subject in self.__content:
+        for subject in self:
             if subject.name.startswith(name) and (nth is None or subject.nth == nth):
                 return subject
         return None
@@ -275,23 +689,40 @@ class Timetable:
     # 월요일 1교시 과목
     """
 
-    def __init__(self, week_range=range(0, len(Week)), period_range=range(1, max_period + 1), data=None):
-        self.__content: dict[tuple[Week, int], Class] = {}
+    # 각 칸은 `pool`의 수업 번호로 (요일, 교시) 순서의 5 × max_period 배열에 저장됨
+    # 슬라이싱한 시간표는 원본과 배열을 공유하다가, 어느 한쪽이 수정될 때 그쪽만 복사함
+    # 연강을 묶은 결과(`blocks`)는 처음 구할 때 저장해 두고, 칸이 바뀌면 버림
+    __slots__ = ('week_range', 'period_range', '__pool', '__cells', '__shared', '__blocks')
+
+    def __init__(self, week_range=range(0, len(Week)), period_range=range(1, max_period + 1), data=None,
+                 pool: ClassPool = None):
         self.week_range = week_range
         self.period_range = period_range
 
         if isinstance(data, Timetable):
-            for week in map(Week, week_range):
-                for period in period_range:
-                    self.__content[week, period] = data.__content[week, period]
+            self.__pool = data.__pool
+            self.__cells = data.__cells
+            self.__shared = data.__shared = True
         else:
-            for week in map(Week, week_range):
-                for period in period_range:
-                    self.__content[week, period] = GAP
+            self.__pool = default_pool if pool is None else pool
+            self.__cells = array('H', [0]) * (len(Week) * max_period)  # 전부 공강
+            self.__shared = False
+        self.__blocks = None
+
+    @staticmethod
+    def __index(week: int, period: int) -> int:
+        if not (0 <= week < len(Week) and 1 <= period <= max_period):
+            raise KeyError((Week(week), period))
+        return week * max_period + period - 1
+
+    def __indices(self):
+        for week in self.week_range:
+            for period in self.period_range:
+                yield Week(week), period, self.__index(week, period)
 
     def value(self):
         if len(self.week_range) == 1 and len(self.period_range) == 1:
-            return self.__content[Week(self.week_range.start), self.period_range.start]
+            return self.__pool[self.__cells[self.__index(self.week_range.start, self.period_range.start)]]
         else:
             raise ValueError(f'invalid value: {self}')
 
@@ -299,10 +730,47 @@ class Timetable:
         return len(self.items())
 
     def items(self, remove_gap=False):
-        return {key: value for key, value in self.__content.items() if not (remove_gap and value == GAP)}.items()
+        return {(week, period): self.__pool[self.__cells[idx]] for week, period, idx in self.__indices()
+                if not (remove_gap and self.__cells[idx] == 0)}.items()
 
     def __iter__(self):
-        return iter({key: value for key, value in self.__content.items()})
+        return iter([(week, period) for week, period, _ in self.__indices()])
+
+    def occupancy(self) -> int:
+        """
+        수업이 있는 칸을 비트로 모은 정수입니다. (요일, 교시)는 `요일 * max_period + 교시 - 1`번 비트이고, 공강이면 0입니다.
+        """
+
+        bits = 0
+        for _, _, idx in self.__indices():
+            if self.__cells[idx] != 0:
+                bits |= 1 << idx
+        return bits
+
+    def blocks(self):
+        """
+        요일마다 같은 수업이 이어지는 칸(연강)을 하나로 묶어 `(요일, 시작 교시, 교시 수, 수업)`을 차례로 돌려줍니다. 공강은 빠집니다.
+        한 번 묶은 결과는 시간표가 바뀔 때까지 재사용합니다.
+        """
+
+        if self.__blocks is None:
+            blocks = []
+            periods = list(self.period_range)
+            for week in self.week_range:
+                i = 0
+                while i < len(periods):
+                    class_id = self.__cells[self.__index(week, periods[i])]
+                    duration = 1
+                    while i + duration < len(periods) and \
+                            self.__cells[self.__index(week, periods[i + duration])] == class_id:
+                        duration += 1
+
+                    if class_id != 0:
+                        blocks.append((Week(week), periods[i], duration, self.__pool[class_id]))
+                    i += duration
+            self.__blocks = tuple(blocks)
+
+        return iter(self.__blocks)
 
     def __getitem__(self, key):
         if isinstance(key, tuple) and len(key) == 2:
@@ -341,21 +809,28 @@ class Timetable:
                 raise TypeError(f'unsupported operand type(s) for []: {type(self)} and {type(key)}')
 
     def __setitem__(self, key, value: Class):
+        class_id = self.__pool.class_id(value)
+
+        if self.__shared:
+            self.__cells = array('H', self.__cells)
+            self.__shared = False
+        self.__blocks = None
+
         if isinstance(key, int):
-            for week in map(Week, self.week_range):
-                self.__content[week, key] = value
+            for week in self.week_range:
+                self.__cells[self.__index(week, key)] = class_id
         elif isinstance(key, str):
             self.__setitem__(Week.from_string(key), value)
         elif isinstance(key, Week):
             for period in self.period_range:
-                self.__content[key, period] = value
+                self.__cells[self.__index(key.value, period)] = class_id
         elif isinstance(key, tuple) and len(key) == 2:
             k1, k2 = key
 
             if isinstance(k2, str) or isinstance(k2, Week):
                 k1, k2 = k2, k1
 
-            self.__content[Week.from_string(k1), k2] = value
+            self.__cells[self.__index(Week.from_string(k1).value, k2)] = class_id
         else:
             raise TypeError(f'unsupported operand type(s) for []: {type(self)} and {type(key)}')
 
@@ -370,8 +845,8 @@ class Timetable:
 
         for period in self.period_range:
             ret += f'{period:<2}'
-            for week in map(Week, self.week_range):
-                subject = self.__content[week, period]
+            for week in self.week_range:
+                subject = self.__pool[self.__cells[self.__index(week, period)]]
                 if subject == GAP:
                     ret += '  ' * 3
                 else:
@@ -382,37 +857,142 @@ class Timetable:
 
     def __eq__(self, other):
         if isinstance(other, Timetable):
-            return self.__content == other.__content and \
-                self.week_range == other.week_range and \
-                self.period_range == other.period_range
+            if self.week_range != other.week_range or self.period_range != other.period_range:
+                return False
+            elif self.__pool is other.__pool:
+                # 같은 번호 체계라면 번호만 비교하면 됨
+                return all(self.__cells[idx] == other.__cells[idx] for _, _, idx in self.__indices())
+            else:
+                return dict(self.items()) == dict(other.items())
         else:
             return False
 
     __str__ = __repr__
 
-    def to_google_cal(self, name):
-        columns = ['Subject', 'Start Date', 'Start Time', 'End Date', 'End Time', 'All Day Event',
-                   'Description']  # , 'Location', 'Private']
-
-        data = []
-        for (week, period), subject in self.items(remove_gap=True):
-            start_date = date(2023, 8, 14 + week.value)
-            end_date = date(2023, 12, 31)
-
-            for d in map(lambda x: start_date + timedelta(days=x), range(0, (end_date - start_date).days, 7)):
-                data.append([
-                    subject.super.name,
-                    d.strftime("%m/%d/%Y"),
-                    times[period - 1].strftime("%I:%M %p"),
-                    d.strftime("%m/%d/%Y"),
-                    (datetime.combine(datetime.min, times[period - 1]) + timedelta(minutes=50)).time().strftime(
-                        "%I:%M %p"),
-                    False,
-                    f"{subject.super.nth}분반"
-                ])
-
-        df = pd.DataFrame(data, columns=columns)
-        return df
+    def to_google_cal(self, name, start: date = term_start, end: date = term_end):
+        """
+        구글 캘린더에서 가져올 수 있는 형식의 표를 만듭니다. 연강은 한 일정으로 묶고, `start` 주부터 `end` 전날까지 매주 한 줄씩 들어갑니다.
+        수업마다 반복되는 날짜를 NumPy로 한꺼번에 펼치고, 날짜 문자열은 서로 다른 날짜만 한 번씩 포맷합니다.
+        """
+
+        blocks = list(self.blocks())
+        if not blocks:
+            return pd.DataFrame([], columns=google_cal_columns)
+
+        weeks = np.fromiter((week.value for week, _, _, _ in blocks), dtype=np.int64, count=len(blocks))
+        periods = np.fromiter((period for _, period, _, _ in blocks), dtype=np.int64, count=len(blocks))
+        durations = np.fromiter((duration for _, _, duration, _ in blocks), dtype=np.int64, count=len(blocks))
+        firsts = np.datetime64(start, 'D') + weeks
+        counts = np.maximum(-((firsts - np.datetime64(end, 'D')).astype(np.int64) // 7), 0)
+
+        owner = np.repeat(np.arange(len(blocks)), counts)
+        nth_week = np.arange(owner.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        days, inverse = np.unique(firsts[owner] + nth_week * 7, return_inverse=True)
+        dates = np.asarray(pd.DatetimeIndex(days).strftime('%m/%d/%Y'), dtype=object)[inverse]
+
+        subjects = np.array([cls.super.name for _, _, _, cls in blocks], dtype=object)
+        descriptions = np.array([f"{cls.super.nth}분반" for _, _, _, cls in blocks], dtype=object)
+
+        return pd.DataFrame({
+            'Subject': subjects[owner],
+            'Start Date': dates,
+            'Start Time': start_times[periods[owner] - 1],
+            'End Date': dates,
+            'End Time': end_times[periods[owner] + durations[owner] - 2],
+            'All Day Event': False,
+            'Description': descriptions[owner]
+        }, columns=google_cal_columns)
+
+    def to_ics(self, name, start: date = term_start, end: date = term_end) -> str:
+        """
+        iCalendar(.ics) 문자열을 만듭니다. 연강은 하나로 묶어서 수업 덩어리마다 매주 반복(`RRULE`)하는 `VEVENT` 하나만 넣고,
+        `end` 전날까지 반복합니다. 강의실은 `LOCATION`, 선생님과 분반은 `DESCRIPTION`에 들어가며, 교사가 없는 수업은 분반만 들어갑니다.
+        `name`은 달력 이름과 각 일정의 UID에 들어가므로, 여러 학생을 한 달력에 넣을 때는 학번처럼 겹치지 않는 값을 넣어야 합니다.
+        """
+
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        until = (datetime.combine(end, time()) - ics_utc_offset - timedelta(seconds=1)).strftime('%Y%m%dT%H%M%SZ')
+
+        lines = [
+            'BEGIN:VCALENDAR',
+            'VERSION:2.0',
+            'PRODID:-//gsa-projects//timetable//KO',
+            'CALSCALE:GREGORIAN',
+            f'X-WR-CALNAME:{ics_escape(f"{name}의 시간표")}',
+            f'X-WR-TIMEZONE:{ics_timezone}',
+            'BEGIN:VTIMEZONE',
+            f'TZID:{ics_timezone}',
+            'BEGIN:STANDARD',
+            'DTSTART:19700101T000000',
+            'TZOFFSETFROM:+0900',
+            'TZOFFSETTO:+0900',
+            'TZNAME:KST',
+            'END:STANDARD',
+            'END:VTIMEZONE'
+        ]
+
+        for week, period, duration, cls in self.blocks():
+            first = start + timedelta(days=week.value)
+            if first >= end:
+                continue
+
+            begin = datetime.combine(first, times[period - 1])
+            finish = datetime.combine(first, times[period + duration - 2]) + class_length
+            lines += [
+                'BEGIN:VEVENT',
+                f'UID:{begin:%Y%m%dT%H%M}-{duration}-{cls.super.nth}-{ics_escape(name)}@timetable',
+                f'DTSTAMP:{stamp}',
+                f'DTSTART;TZID={ics_timezone}:{begin:%Y%m%dT%H%M%S}',
+                f'DTEND;TZID={ics_timezone}:{finish:%Y%m%dT%H%M%S}',
+                f'RRULE:FREQ=WEEKLY;UNTIL={until}',
+                f'SUMMARY:{ics_escape(cls.super.name)}'
+            ]
+            if cls.teacher is None:
+                lines.append(f'DESCRIPTION:{ics_escape(f"{cls.super.nth}분반")}')
+            else:
+                lines += [
+                    f'LOCATION:{ics_escape(cls.teacher.classroom)}',
+                    f'DESCRIPTION:{ics_escape(f"{cls.teacher.name}T {cls.super.nth}분반")}'
+                ]
+            lines.append('END:VEVENT')
+
+        lines.append('END:VCALENDAR')
+        return ''.join(ics_fold(line) + '\r\n' for line in lines)
+
+    def to_image(self, font: str = None):
+        """
+        시간표를 앱 창과 같은 배치와 색으로 PIL 이미지에 그립니다. 화면이 없어도 됩니다.
+        `font`는 한글 글꼴 파일 경로이고, 없으면 설치된 한글 글꼴을 찾습니다(`image_font`). 못 찾으면 `OSError`가 납니다.
+        """
+
+        from PIL import Image, ImageDraw
+
+        image = Image.new('RGB', image_size, '#fafafa')
+        draw = ImageDraw.Draw(image)
+        text_font = image_font(font)
+
+        # 요일 행과 교시 열
+        draw.rectangle((0, 0, period_width - 1, image_size[1]), fill='#eeeeee')
+        draw.rectangle((0, 0, image_size[0], week_height - 1), fill='#eeeeee')
+        for i in range(1, max_period):
+            draw.text((period_width // 2, week_height + (i - 0.5) * default_height), f'{i}', fill='#000000',
+                      font=text_font, anchor='mm')
+        for week in Week:
+            draw.text((period_width + (week.value + 0.5) * default_width, week_height // 2), week.name,
+                      fill='#000000', font=text_font, anchor='mm')
+
+        border = 4  # ClassBlock의 테두리와 여백
+        for week, period, duration, cls in self.blocks():
+            x = period_width + week.value * default_width
+            y = week_height + (period - 1) * default_height
+            height = default_height * duration
+
+            draw.rectangle((x + border, y + border, x + default_width - border - 1, y + height - border - 1),
+                           fill=cls.super.type.color[0])
+            draw.multiline_text((x + default_width // 2, y + height // 2), split(cls.super.name.replace(' ', ''), 5),
+                                fill='#000000', font=text_font, anchor='mm', align='left')
+
+        return image
 
 @dataclass
 class Student:
@@ -484,145 +1064,480 @@ class Student:
 
     __str__ = __repr__
 
-    def get_google_cal(self):
-        return self.timetable.to_google_cal(self.name)
+    def get_google_cal(self, start: date = term_start, end: date = term_end):
+        return self.timetable.to_google_cal(self.name, start, end)
+
+    def get_ics(self, start: date = term_start, end: date = term_end):
+        # 이름이 같은 학생끼리 UID가 겹치지 않도록 학번까지 넘김
+        return self.timetable.to_ics(str(self), start, end)
+
+    def get_image(self, font: str = None):
+        return self.timetable.to_image(font)
+
+class LazyStudent(Student):
+    """
+    시간표와 수업을 처음 쓸 때 해석하는 학생입니다. 그 전까지는 학번, 이름과 엑셀의 원본 칸만 들고 있습니다.
+    """
+
+    def __init__(self, id: int, name: str, lines: list[tuple], parser: 'StudentParser'):
+        self.id = id
+        self.name = name
+        self.__lines = lines
+        self.__parser = parser
+        self.__parsed: tuple[Timetable, ClassSet] | None = None
+
+    def __parse(self) -> tuple[Timetable, ClassSet]:
+        if self.__parsed is None:
+            self.__parsed = self.__parser.parse_lines(self.__lines)
+            self.__lines = None  # 해석하고 나면 필요 없음
+        return self.__parsed
+
+    @property
+    def loaded(self) -> bool:
+        return self.__parsed is not None
+
+    @property
+    def timetable(self) -> Timetable:
+        return self.__parse()[0]
+
+    @property
+    def classes(self) -> ClassSet:
+        return self.__parse()[1]
+
+class StudentParser:
+    """
+    학생 시간표 블록 하나(`StudentList.read_blocks`)를 `Student`로 해석합니다.
+    과목/교사 색인과 다교사수업 시간표, `ClassPool`을 들고 있어서 모든 학생이 같은 파서를 공유합니다.
+    """
+
+    subject_pattern = re.compile(r'(?P<name>[\w\d\(\) ]+) (?P<nth>\d)반 \((?P<time>\d)시간\)')
+
+    def __init__(self, subject_index: dict[str, tuple[tuple[Teacher, ...], list[tuple[Teacher, tuple]]]],
+                 schedule: TeacherSchedule, pool: ClassPool):
+        self.subject_index = subject_index
+        self.schedule = schedule
+        self.pool = pool
+
+    @staticmethod
+    def parse_header(header: str) -> tuple[int, str]:
+        # '22001강산원' -> (22001, '강산원')
+        return int(header[:5]), header[5:]
+
+    def parse(self, header: str, lines: list[tuple], lazy: bool = False) -> Student:
+        student_id, name = self.parse_header(header)
+
+        if lazy:
+            return LazyStudent(id=student_id, name=name, lines=lines, parser=self)
+
+        timetable, subjects = self.parse_lines(lines)
+        return Student(id=student_id, name=name, timetable=timetable, classes=subjects)
+
+    def parse_lines(self, lines: list[tuple]) -> tuple[Timetable, ClassSet]:
+        return self.build(self.resolve_lines(lines))
+
+    def resolve_lines(self, lines: list[tuple]) -> list[tuple[Week, int, str, int, int, int]]:
+        """
+        원본 칸들을 해석해서 (요일, 교시, 과목 이름, 시수, 분반, 교사 번호) 목록으로 돌려줍니다.
+        교사 번호는 과목 색인의 교사 튜플에서의 위치입니다. 객체를 만들지 않으므로 다른 프로세스에서 해석해도 됩니다.
+        """
+
+        resolved = []
+        for period, line in enumerate(lines, start=1):
+            for week, subject in zip(Week, line):
+                if subject is None or subject == GAP.super.name:
+                    continue
+
+                matched = self.subject_pattern.match(subject)
+                # '기업가정신 및 기술창업교육(2) 1반 (2시간)' 같은 (2) 가 이름에 들어가는 예외가;
+                name = transform(matched.group('name')).replace('(2)', '')
+                time = int(matched.group('time'))
+                nth = int(matched.group('nth'))
+                teachers, schedule_rows = self.subject_index.get(name, ((), []))
+
+                if name not in self.subject_index:
+                    print(Subject(name, time, nth, teachers))
+
+                if not schedule_rows:
+                    teacher = next(iter(teachers), None)
+                else:
+                    teacher = self.schedule.get(name, week, period, nth)
+
+                if teacher is None:
+                    raise ValueError(Subject(name, time, nth, teachers))
+
+                resolved.append((week, period, name, time, nth, teachers.index(teacher)))
+
+        return resolved
+
+    def build(self, resolved: list[tuple[Week, int, str, int, int, int]]) -> tuple[Timetable, ClassSet]:
+        """
+        `resolve_lines`의 결과로 `pool`에서 꺼낸 객체들로 이루어진 시간표와 수업을 만듭니다.
+        """
+
+        pool = self.pool
+
+        # 각 학생의 시간표
+        timetable = Timetable(pool=pool)
+
+        # 각 학생의 수업
+        subjects = ClassSet(pool=pool)
+        for week, period, name, time, nth, teacher in resolved:
+            teachers = self.subject_index.get(name, ((), []))[0]
+            subject_instance = pool.intern_subject(name=name, time=time, nth=nth, teachers=teachers)
+
+            subjects.add(subject_instance)
+            timetable[week, period] = pool.intern_class(subject_instance, teachers[teacher])
+
+        return timetable, subjects
+
+    # 작업 프로세스마다 한 번만 받아 두는 파서
+    worker: 'StudentParser' = None
+
+    @staticmethod
+    def init_worker(parser: 'StudentParser'):
+        StudentParser.worker = parser
+
+    @staticmethod
+    def resolve_chunk(chunk: list[tuple[str, list[tuple]]]) -> list[tuple[str, list[tuple]]]:
+        return [(header, StudentParser.worker.resolve_lines(lines)) for header, lines in chunk]
+
+class LoadCancelled(Exception):
+    """
+    `StudentList.load`/`parse` 도중 `cancel`이 설정되어 불러오기를 멈췄을 때 발생합니다.
+    """
 
 class StudentList:
+    margin = 1  # 학생 간 줄 간격
+    line_per_student = 1 + max_period + margin  # 각 학생이 차지하는 행 수
+
+    @staticmethod
+    def index_subjects(classroom_data: pd.DataFrame, teacher_data: pd.DataFrame, pool: ClassPool = None) \
+            -> dict[str, tuple[tuple[Teacher, ...], list[tuple[Teacher, tuple]]]]:
+        """
+        공백 제거된 과목 이름 -> (교사 튜플, 다교사수업 시간표 행들) 색인을 만듭니다.
+        시간표 행은 (교사, 월~금 시간표 문자열) 튜플이며, 다교사수업이 아니면 비어 있습니다.
+        `classroom_data`와 `teacher_data`의 과목 이름은 이미 공백이 제거되어 있어야 합니다. 교사 이름은 공백을 빼고 맞춰 보며,
+        다교사수업 시트의 교사가 강의실 시트에 없으면 `ValueError`를 냅니다. 교사는 `pool`에서 꺼내므로 같은 교사는 같은 객체입니다.
+        """
+
+        if pool is None:
+            pool = ClassPool()
+
+        # 다교사수업 시트에서 각 과목이 처음 나오는 행
+        first_rows: dict[str, int] = {}
+        for row, name in enumerate(teacher_data['교과']):
+            if not pd.isna(name):
+                first_rows.setdefault(name, row)
+
+        index = {}
+        for _, record in classroom_data.iterrows():
+            name = record['과목']
+            if name in index:
+                continue
+
+            # [학년, 과목] 컬럼 제거, 빈 칸이 공백 문자열로 들어 있기도 해서 같이 뺌
+            cells = record.dropna()
+            cells = cells[cells.map(lambda x: str(x).strip() != '')].iloc[2:]
+
+            teachers = {}
+            for i in range(0, len(cells) - 1, 2):
+                # [..., '장경아', '본 302', ...] 이렇게 i, i + 1번 째 컬럼이 있음
+                instance = pool.intern_teacher(name=cells.iloc[i], classroom=cells.iloc[i + 1])
+                # 두 시트가 교사 이름을 다르게 띄어 쓰기도 함 ('박새별, 원어민', '박새별,원어민')
+                teachers[transform(instance.name)] = instance
+
+            schedule_rows = []
+            if name in first_rows:
+                start_idx = first_rows[name]
+                for row in range(start_idx, min(start_idx + len(teachers), len(teacher_data))):
+                    if row > start_idx and not pd.isna(teacher_data['교과'].iloc[row]):
+                        break  # 다음 과목
+
+                    schedules = tuple(teacher_data.iloc[row, len(['학년', '교과', '교사명']):][:len(Week)])
+                    teacher = teacher_data['교사명'].iloc[row]
+                    if transform(teacher) not in teachers:
+                        raise ValueError(f'unknown teacher: {teacher} ({name})')
+                    schedule_rows.append((teachers[transform(teacher)], schedules))
+
+            index[name] = (tuple(teachers.values()), schedule_rows)
+
+        return index
+
+    @staticmethod
+    def cache_key(timetable_path: str, subject_path: str, grade: int = 2, semester: int = 2) -> str:
+        """
+        두 엑셀 파일의 내용, 학년, 학기와 `loader_version`으로 만든 캐시 키입니다. 파일이 하나라도 바뀌면 키도 바뀝니다.
+        pickle에는 모듈 경로가 들어가므로, 이 모듈을 불러온 이름(`timetable`, `src.timetable`)마다 캐시를 따로 둡니다.
+        과목 분류(`Subject.type`)도 캐시에 들어가므로 지금 `classify`의 분류표도 키에 섞습니다.
+        """
+
+        digest = hashlib.sha256(f'timetable-{loader_version}-{__name__}-{grade}-{semester}-{classify.digest()}'.encode())
+        for path in (timetable_path, subject_path):
+            with open(path, 'rb') as f:
+                file_digest = hashlib.sha256()
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    file_digest.update(chunk)
+            digest.update(file_digest.digest())
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def load(timetable_path: str, subject_path: str, cache_dir: str = None, lazy: bool = False, workers: int = None,
+             progress: Callable[[int, int | None], None] = None, cancel: threading.Event = None,
+             grade: int = 2, semester: int = 2):
+        """
+        `grade`학년 학생 시간표 파일과 강의실 파일에서 `semester`학기 학생 목록을 불러옵니다. `cache_dir`를 주면 해석한 결과를
+        두 파일 내용의 해시(`cache_key`)를 이름으로 pickle해 두고, 다음부터는 엑셀을 읽지 않고 바로 불러옵니다.
+        `lazy`, `workers`, `progress`, `cancel`은 `parse`와 같습니다(`lazy`이면 `workers`는 무시됨).
+        """
+
+        return StudentList.load_grades({grade: timetable_path}, subject_path, semester, cache_dir=cache_dir, lazy=lazy,
+                                       workers=workers, progress=progress, cancel=cancel)[grade]
+
+    @staticmethod
+    def load_grades(timetable_paths: dict[int, str], subject_path: str, semester: int = 2, merge: bool = False,
+                    cache_dir: str = None, lazy: bool = False, workers: int = None,
+                    progress: Callable[[int, int | None], None] = None, cancel: threading.Event = None) \
+            -> 'StudentList | dict[int, StudentList]':
+        """
+        여러 학년을 한 번에 불러옵니다. `timetable_paths`는 학년 -> 학생 시간표 파일이고, 강의실 파일은 한 번만 읽어서
+        모든 학년이 같이 씁니다. 학년 -> `StudentList`를 돌려주고, `merge`이면 한 `StudentList`로 합쳐서 돌려줍니다.
+        나머지 인자는 `load`와 같습니다. 캐시는 학년마다 따로 저장되고, `progress`도 학년마다 새로 셉니다.
+        """
+
+        subject_data = None  # 캐시가 없는 학년이 있을 때만 읽음
+        loaded: dict[int, StudentList] = {}
+
+        for grade, timetable_path in timetable_paths.items():
+            cache_path = None
+            if cache_dir is not None:
+                cache_name = StudentList.cache_key(timetable_path, subject_path, grade, semester) + \
+                             ('-lazy' if lazy else '')
+                cache_path = os.path.join(cache_dir, f'{cache_name}.pickle')
+
+                students = StudentList.read_cache(cache_path)
+                if students is not None:
+                    if progress is not None:
+                        progress(len(students), len(students))
+                    loaded[grade] = students
+                    continue
+
+            if subject_data is None:
+                subject_data = StudentList.read_subjects(subject_path, semester)
+
+            loaded[grade] = StudentList.parse_grade(timetable_path, *subject_data, grade=grade, lazy=lazy,
+                                                    workers=workers, progress=progress, cancel=cancel)
+
+            if cache_path is not None:
+                StudentList.write_cache(cache_path, loaded[grade])
+
+        if merge:
+            merged = StudentList()
+            merged.extend(student for students in loaded.values() for student in students)
+            return merged
+        else:
+            return loaded
+
+    @staticmethod
+    def read_cache(cache_path: str) -> 'StudentList | None':
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            with open(cache_path, 'rb') as f:
+                students = pickle.load(f)
+        except Exception:
+            # 깨진 캐시나 다른 경로(`src.timetable` 등)로 불러온 모듈이 쓴 캐시는 무시하고 다시 만듦
+            return None
+
+        return students if isinstance(students, StudentList) else None
+
+    @staticmethod
+    def write_cache(cache_path: str, students: 'StudentList'):
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+            # 쓰는 도중에 꺼져도 깨진 캐시가 남지 않도록 임시 파일에 쓰고 바꿔치기함
+            temp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as f:
+                pickle.dump(students, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            pass  # 캐시를 못 써도 불러오기는 성공한 것
+
+    @staticmethod
+    def semesters(subject_path: str) -> list[int]:
+        """
+        강의실 파일에 있는 'n학기 강의실' 시트들의 학기입니다. 강의실 파일이 아니면 비어 있습니다.
+        """
+
+        workbook = load_workbook(subject_path, read_only=True)
+        try:
+            names = workbook.sheetnames
+        finally:
+            workbook.close()
+
+        return sorted(int(matched.group(1)) for matched in map(lambda x: re.fullmatch(r'(\d)학기 강의실', x), names)
+                      if matched is not None)
+
     @staticmethod
-    def load(timetable_path: str, subject_path: str):
-        margin = 1  # 학생 간 줄 간격
-        line_per_student = 1 + max_period + margin  # 각 학생이 차지하는 행 수
+    def read_subjects(subject_path: str, semester: int = 2) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        강의실 파일에서 `semester`학기 강의실 시트와 다교사수업 시트를 읽어, 과목 이름을 정규화해서 돌려줍니다.
+        모든 학년이 들어 있으므로 학년별로 나누는 것은 `parse_grade`에서 합니다.
+        """
 
         # 판다스 데이터프레임으로 엑셀 파일 일기
-        timetable_data = pd.read_excel(timetable_path, header=None)  # 원본 데이터
-        classroom_data = pd.read_excel(subject_path, sheet_name='2학기 강의실')
+        classroom_data = pd.read_excel(subject_path, sheet_name=f'{semester}학기 강의실')
         teacher_data = pd.read_excel(subject_path, sheet_name='과목별 다교사수업')
 
-        # 공백 제거해서 비교 손쉽게 만드는 함수
-        transform = lambda x: x if pd.isna(x) else x.replace(' ', '').replace('Ⅳ', 'IV').replace('Ⅲ', 'III').replace(
-            'Ⅱ', 'II').replace('Ⅰ', 'I')
-
         # 공백 제거해서 비교 손쉽게 만듦
         classroom_data['과목'] = classroom_data['과목'].apply(transform)
+        teacher_data['교과'] = teacher_data['교과'].apply(transform)
 
-        # 2학년만 분리함
-        classroom_data = classroom_data[classroom_data['학년'] == 2]
-
-        lack_count = line_per_student - len(timetable_data) % line_per_student  # 부족한 행 수
-        for _ in range(lack_count):
-            timetable_data.loc[len(timetable_data)] = [nan] * 5  # 부족한 행 수만큼 빈 행 추가
-
-        headcount = len(timetable_data) // line_per_student  # 학생 수
-
-        students = StudentList()
-
-        for i in range(headcount):
-            # 각 학생 시간표 행 시작점과 끝점
-            start_line = (line_per_student * i)
-            end_line = line_per_student * (i + 1) - margin
-
-            # 각 학생의 정보
-            header = timetable_data.iloc[start_line][0]
-            each_student = (int(header[:5]), header[5:])
-
-            # 각 학생의 시간표
-            timetable = Timetable()
-            xlsx_data = timetable_data[start_line + 1:end_line] \
-                .rename(columns={0: '월', 1: '화', 2: '수', 3: '목', 4: '금'}) \
-                .fillna('공강')
-            xlsx_data.index = range(1, len(xlsx_data) + 1)
-
-            # 각 학생의 수업
-            subjects = ClassSet()
-            for period in range(1, max_period + 1):
-                for week, subject in xlsx_data.iloc[period - 1].items():
-                    if subject != GAP.super.name:
-                        matched = re.match('(?P<name>[\w\d\(\) ]+) (?P<nth>\d)반 \((?P<time>\d)시간\)', subject)
-                        subject_instance = Subject(
-                            name=transform(matched.group('name')).replace('(2)', ''),
-                            # '기업가정신 및 기술창업교육(2) 1반 (2시간)' 같은 (2) 가 이름에 들어가는 예외가;
-                            time=int(matched.group('time')),
-                            nth=int(matched.group('nth')),
-                        )
-                        class_instance = Class(subject_instance)
-
-                        teacher_classroom = classroom_data[
-                            classroom_data['과목'] == subject_instance.name.replace(' ', '')].dropna(axis=1)
-
-                        # [학년, 과목] 컬럼 제거
-                        teacher_classroom = teacher_classroom.iloc[:, 2:]
-
-                        if teacher_classroom.empty:
-                            print(subject_instance)
-
-                        teachers = {}
-                        for i in range(0, len(teacher_classroom.columns) - 1, 2):
-                            # [..., '장경아', '본 302', ...] 이렇게 i, i + 1번 째 컬럼이 있음
-                            instance = Teacher(name=teacher_classroom.iloc[:, i].item(),
-                                               classroom=teacher_classroom.iloc[:, i + 1].item())
-                            teachers[instance.name] = instance
-
-                        subject_instance.teachers = tuple(teachers.values())
-
-                        teacher = None
-                        teacher_data['교과'] = teacher_data['교과'].apply(transform)
-                        is_many_teacher = teacher_data[teacher_data['교과'] == subject_instance.name.replace(' ', '')]
-
-                        if is_many_teacher.empty:
-                            teacher = next(iter(teachers.values()))
-                        else:
-                            start_idx = is_many_teacher.index[0]
-                            for row in range(start_idx, start_idx + len(teachers)):
-                                times = teacher_data.iloc[row, len(['학년', '교과', '교사명']) + Week.from_string(week).value]
-
-                                if pd.isna(times):
-                                    continue
-
-                                complex_schedules = times.split('/')
-
-                                for sche in complex_schedules:
-                                    # 3,4(2분반) -> 2분반을 3, 4 교시에 한다
-                                    matched = re.match(r'(?P<periods>\d(?:,\d)*)\((?P<nth>\d)분반\)', sche)
-
-                                    if matched is None:
-                                        # 아니... 분반이 하나면 3교시 or 3,4교시 로 써놨음;
-                                        matched = re.match(r'(?P<periods>\d(?:,\d)*)교시', sche)
-                                        periods = list(map(int, matched.group('periods').split(',')))
-
-                                        if period in periods:
-                                            teacher = teachers[teacher_data['교사명'].iloc[row]]
-                                            break
-                                    else:
-                                        # "3,4(2분반)"
-                                        # periods = [3, 4]
-                                        # nth = 2
-
-                                        periods = list(map(int, matched.group('periods').split(',')))
-                                        nth = int(matched.group('nth'))
-
-                                        if period in periods and subject_instance.nth == nth:
-                                            teacher = teachers[teacher_data['교사명'].iloc[row]]
-                                            break
-
-                                if teacher is not None:
-                                    break
-
-                        if teacher is None:
-                            raise ValueError(subject_instance)
-
-                        class_instance.teacher = teacher
-                        subjects.add(subject_instance)
-                        timetable[week, period] = class_instance
-
-            # 저장
-            students[each_student[0]] = Student(
-                id=each_student[0],
-                name=each_student[1],
-                timetable=timetable,
-                classes=subjects
-            )
+        # 다교사수업 시트는 학년이 각 학년 첫 행에만 적혀 있음
+        teacher_data['학년'] = teacher_data['학년'].ffill()
+
+        return classroom_data, teacher_data
+
+    @staticmethod
+    def read_blocks(timetable_path: str):
+        """
+        학생 시간표 파일을 openpyxl 읽기 전용 모드로 한 줄씩 읽으면서, 학생마다 (머리 줄, 시간표 줄들)을 하나씩 돌려줍니다.
+        머리 줄은 '22001강산원' 같은 첫 칸이고, 시간표 줄들은 1교시부터 `max_period`개의 (월, 화, 수, 목, 금) 튜플입니다.
+        파일 전체를 메모리에 올리지 않으므로 학생 수와 상관없이 메모리 사용량이 일정합니다.
+        """
+
+        line_per_student = StudentList.line_per_student
+        empty_line = (None,) * len(Week)
+
+        workbook = load_workbook(timetable_path, read_only=True)
+        try:
+            block = []
+            for row in workbook.worksheets[0].iter_rows(values_only=True):
+                block.append((tuple(row) + empty_line)[:len(Week)])
+
+                if len(block) == line_per_student:
+                    if block[0][0] is not None:
+                        yield block[0][0], block[1:1 + max_period]
+                    block = []
+
+            # 마지막 학생은 뒤쪽 빈 행이 없을 수 있음
+            if block and block[0][0] is not None:
+                lines = block[1:1 + max_period]
+                yield block[0][0], lines + [empty_line] * (max_period - len(lines))
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def headcount(timetable_path: str) -> int | None:
+        """
+        학생 시간표 파일의 행 수로 어림한 학생 수입니다. 파일에 크기 정보가 없으면 None입니다.
+        """
+
+        workbook = load_workbook(timetable_path, read_only=True)
+        try:
+            max_row = workbook.worksheets[0].max_row
+        finally:
+            workbook.close()
+
+        return ceil(max_row / StudentList.line_per_student) if max_row else None
 
-        return students
+    @staticmethod
+    def parse(timetable_path: str, subject_path: str, lazy: bool = False, workers: int = None, chunk_size: int = 32,
+              progress: Callable[[int, int | None], None] = None, cancel: threading.Event = None,
+              grade: int = 2, semester: int = 2):
+        """
+        `grade`학년 학생 시간표 파일과 강의실 파일을 `semester`학기 기준으로 해석합니다.
+        `lazy`이면 학생마다 학번, 이름, 원본 칸만 기록해 두고 시간표와 수업은 처음 쓸 때 해석합니다(`LazyStudent`).
+        `workers`가 2 이상이면 학생 블록을 `chunk_size`명씩 묶어 그 수만큼의 프로세스에서 해석합니다. 파일은 처리하는 만큼만
+        앞서 읽습니다. 결과는 하나씩 해석할 때와 같습니다. `lazy`이면 해석할 것이 없으므로 `workers`는 무시됩니다.
+        `progress`는 학생을 해석할 때마다 (해석한 학생 수, 전체 학생 수)로 불리고, 전체 학생 수는 `headcount`의 어림값입니다.
+        `cancel`이 설정되면 `LoadCancelled`를 발생시키고 멈춥니다.
+        """
+
+        classroom_data, teacher_data = StudentList.read_subjects(subject_path, semester)
+        return StudentList.parse_grade(timetable_path, classroom_data, teacher_data, grade=grade, lazy=lazy,
+                                       workers=workers, chunk_size=chunk_size, progress=progress, cancel=cancel)
+
+    @staticmethod
+    def parse_grade(timetable_path: str, classroom_data: pd.DataFrame, teacher_data: pd.DataFrame, grade: int = 2,
+                    lazy: bool = False, workers: int = None, chunk_size: int = 32,
+                    progress: Callable[[int, int | None], None] = None, cancel: threading.Event = None):
+        """
+        `read_subjects`로 읽어 둔 강의실/다교사수업 표로 `grade`학년 학생 시간표 파일을 해석합니다. 나머지 인자는 `parse`와 같습니다.
+        """
+
+        # 해당 학년만 분리함
+        classroom_data = classroom_data[classroom_data['학년'] == grade]
+        teacher_data = teacher_data[teacher_data['학년'].isin([grade, f'{grade}학년'])]
+
+        # 과목 이름 -> (교사들, 다교사수업 시간표 행들) 색인을 미리 만들어 둠
+        # 같은 교사, 분반, 수업은 모든 학생이 같은 객체를 공유함
+        pool = ClassPool()
+        subject_index = StudentList.index_subjects(classroom_data, teacher_data, pool)
+
+        # (과목, 요일, 교시, 분반) -> 교사 다교사수업 시간표도 미리 해석해 둠
+        schedule = TeacherSchedule.from_index(subject_index)
+
+        parser = StudentParser(subject_index, schedule, pool)
+        students: dict[int, Student] = {}  # 같은 학번이 또 나오면 나중 것으로 덮어씀
+
+        total = StudentList.headcount(timetable_path) if progress is not None else None
+        done = 0
+
+        if workers is not None and workers > 1 and not lazy:
+            # 학생 블록들을 묶음으로 나눠 여러 프로세스에서 해석하고, 객체는 이 프로세스의 pool에서 꺼냄
+            # 파일 전체를 미리 읽어 두지 않도록 묶음은 `workers * 2`개까지만 보내 두고, 끝난 것부터 순서대로 받음
+            blocks = StudentList.read_blocks(timetable_path)
+            chunks = iter(lambda: list(islice(blocks, chunk_size)), [])
+            pending = deque()
+
+            def collect():
+                nonlocal done
+
+                chunk = pending.popleft().result()
+                for header, resolved in chunk:
+                    student_id, name = parser.parse_header(header)
+                    timetable, subjects = parser.build(resolved)
+                    students[student_id] = Student(id=student_id, name=name, timetable=timetable, classes=subjects)
+
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+
+            with ProcessPoolExecutor(workers, initializer=StudentParser.init_worker, initargs=(parser,)) as executor:
+                try:
+                    for chunk in chunks:
+                        if cancel is not None and cancel.is_set():
+                            raise LoadCancelled()
+
+                        pending.append(executor.submit(StudentParser.resolve_chunk, chunk))
+                        if len(pending) >= workers * 2:
+                            collect()
+
+                    while pending:
+                        if cancel is not None and cancel.is_set():
+                            raise LoadCancelled()
+                        collect()
+                except LoadCancelled:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+        else:
+            # 학생 시간표 파일은 한 학생씩 읽어가며 바로 해석함
+            for header, lines in StudentList.read_blocks(timetable_path):
+                if cancel is not None and cancel.is_set():
+                    raise LoadCancelled()
+
+                student = parser.parse(header, lines, lazy=lazy)
+                students[student.id] = student
+
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+
+        # 마지막에 한 번만 정렬
+        return StudentList(students.values())
 
     def __init__(self, args=None):
         if args is None:
@@ -632,6 +1547,62 @@ class StudentList:
         if self.__students:
             self.__students.sort(key=lambda x: x.id)
 
+        # 학번, 이름 -> 학생 색인, 리스트와 항상 같이 바뀜
+        self.__by_id: dict[int, Student] = {}
+        self.__by_name: dict[str, list[Student]] = {}
+        for student in self.__students:
+            self.__index(student)
+
+        self.__positions: dict[int, int] | None = None  # id(학생) -> 리스트 위치, 삽입하면 지웠다가 필요할 때 다시 만듦
+        self.__overlap: np.ndarray | None = None  # 겹치는 시수 행렬 캐시, 학생이 바뀌면 지움
+        self.__search: tuple[list[str], list[Student]] | None = None  # 검색용 정렬된 키 색인, 학생이 바뀌면 지움
+        self.__occupancy: np.ndarray | None = None  # 학생별 `Timetable.occupancy()` 캐시, 학생이 바뀌면 지움
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_StudentList__positions'] = None  # id(학생)은 프로세스마다 다름
+        return state
+
+    def __index(self, student: Student):
+        self.__by_id[student.id] = student
+        self.__by_name.setdefault(student.name, []).append(student)
+
+    def __unindex(self, student: Student):
+        if self.__by_id.get(student.id) is student:
+            del self.__by_id[student.id]
+
+        same_name = self.__by_name[student.name]
+        same_name.remove(next(e for e in same_name if e is student))
+        if not same_name:
+            del self.__by_name[student.name]
+
+    def __position(self, student: Student) -> int:
+        if self.__positions is None:
+            self.__positions = {id(e): i for i, e in enumerate(self.__students)}
+        return self.__positions[id(student)]
+
+    def __find(self, key: int | str | tuple[int, str] | Student) -> Student | None:
+        """
+        학번, 이름, (학번, 이름), 학생으로 학생을 찾습니다. 이름이 같은 학생이 여럿이면 학번이 가장 작은 학생입니다.
+        """
+
+        if isinstance(key, Student):
+            found = self.__by_id.get(key.id)
+            return found if found is key or found == key else None
+        elif isinstance(key, int):
+            return self.__by_id.get(key)
+        elif isinstance(key, str):
+            same_name = self.__by_name.get(key)
+            return min(same_name, key=lambda x: x.id) if same_name else None
+        elif isinstance(key, tuple) and len(key) == 2:
+            found = self.__by_id.get(key[0])
+            return found if found is not None and found.name == key[1] else None
+        else:
+            return None
+
+    def __contains__(self, key: int | str | tuple[int, str] | Student):
+        return self.__find(key) is not None
+
     def __iter__(self):
         return iter(self.__students)
 
@@ -650,26 +1621,51 @@ class StudentList:
             if isinstance(key, str) and key.isdigit():
                 return self[int(key)]
 
-            for e in self.__students:
-                if e == key:
-                    return e
-            return None
+            return self.__find(key)
 
     def append(self, value: Student):
-        idx = len(self.__students)
-        for i in range(len(self.__students)):
-            if self.__students[i].id > value.id:
-                idx = i
+        # 학번 순서를 유지하도록 학번이 더 큰 첫 학생 앞에 넣음
+        idx = bisect_right(self.__students, value.id, key=lambda x: x.id)
 
         self.__students.insert(idx, value)
+        self.__index(value)
+        self.__positions = None
+        self.__overlap = None
+        self.__search = None
+        self.__occupancy = None
+
+    def extend(self, values):
+        """
+        여러 학생을 한 번에 추가합니다. 하나씩 `append`하지 않고 마지막에 한 번만 정렬합니다.
+        """
+
+        values = list(values)
+        self.__students.extend(values)
+        self.__students.sort(key=lambda x: x.id)
+
+        for value in values:
+            self.__index(value)
+        self.__positions = None
+        self.__overlap = None
+        self.__search = None
+        self.__occupancy = None
 
     def __setitem__(self, key: int | str | tuple[int, str] | Student, value: Student):
         e = self[key]
 
-        if e not in self.__students:
+        if e is None:
             self.append(value)
         else:
-            self.__students[self.__students.index(e)] = value
+            position = self.__position(e)
+            self.__unindex(e)
+
+            self.__students[position] = value
+            self.__index(value)
+            del self.__positions[id(e)]
+            self.__positions[id(value)] = position
+            self.__overlap = None
+            self.__search = None
+            self.__occupancy = None
 
     def __repr__(self) -> str:
         ret = '[\n'
@@ -684,6 +1680,222 @@ class StudentList:
     def to_str(self) -> list[str, ...]:
         return list(map(str, self.__students))
 
+    def search(self, prefix: str, limit: int = None) -> list[Student]:
+        """
+        학번, 이름, 이름의 초성('ㄱㅅㅇ')이 `prefix`로 시작하는 학생들을 키 순서대로 `limit`명까지 돌려줍니다.
+        모든 키를 정렬해 둔 색인에서 이분 탐색으로 시작 위치를 찾으므로, 학생 수가 늘어도 앞에서부터 맞는 만큼만 봅니다.
+        """
+
+        if self.__search is None:
+            entries = sorted(
+                (key, i) for i, student in enumerate(self.__students)
+                for key in (str(student.id), student.name, choseong(student.name))
+            )
+            self.__search = [key for key, _ in entries], [self.__students[i] for _, i in entries]
+
+        keys, students = self.__search
+        prefix = prefix.replace(' ', '')
+
+        found: list[Student] = []
+        seen = set()
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix) or len(found) == limit:
+                break
+            if id(students[i]) not in seen:
+                seen.add(id(students[i]))
+                found.append(students[i])
+
+        return found
+
+    def __occupancies(self) -> np.ndarray:
+        if self.__occupancy is None:
+            self.__occupancy = np.fromiter((student.timetable.occupancy() for student in self.__students),
+                                           dtype=np.uint64, count=len(self.__students))
+        return self.__occupancy
+
+    def __members(self, students) -> np.ndarray:
+        """
+        학번, 이름, (학번, 이름), 학생들로 받은 무리를 리스트 위치로 바꿉니다. `None`이면 전체 학생입니다.
+        같은 학생이 여러 번 들어 있어도 한 번만 세도록, 겹치지 않는 위치들을 순서대로 돌려줍니다.
+        """
+
+        if students is None:
+            return np.arange(len(self.__students))
+
+        positions = []
+        for key in students:
+            found = self.__find(int(key) if isinstance(key, str) and key.isdigit() else key)
+            if found is None:
+                raise KeyError(key)
+            positions.append(self.__position(found))
+        return np.unique(np.array(positions, dtype=np.int64))
+
+    @staticmethod
+    def __periods(period_range) -> list[int]:
+        periods = list(period_range)
+        invalid = [period for period in periods if not (isinstance(period, int) and 1 <= period <= max_period)]
+        if invalid:
+            raise ValueError(f'invalid period: {invalid} (1 ~ {max_period})')
+        return periods
+
+    def free_periods(self, students=None, period_range=range(1, max_period + 1)) -> list[tuple[Week, int]]:
+        """
+        `students`가 모두 공강인 (요일, 교시)들을 요일, 교시 순서로 돌려줍니다. 학생마다 미리 구한 수업 비트들을 OR 한 번으로 합칩니다.
+        """
+
+        periods = self.__periods(period_range)
+        busy = int(np.bitwise_or.reduce(self.__occupancies()[self.__members(students)], initial=np.uint64(0)))
+        return [(week, period) for week in Week for period in periods
+                if not busy >> (week.value * max_period + period - 1) & 1]
+
+    def least_busy_period(self, students=None, period_range=range(1, max_period + 1)) \
+            -> tuple[tuple[Week, int], list[Student]]:
+        """
+        `students` 중 수업이 있는 학생이 가장 적은 (요일, 교시)와 그때 수업이 있는 학생들을 돌려줍니다. 같으면 앞선 칸입니다.
+        모두 공강인 칸이 없을 만큼 큰 무리에서 모임 시간을 정할 때 씁니다. `period_range`가 비어 있으면 `ValueError`가 납니다.
+        """
+
+        periods = self.__periods(period_range)
+        if not periods:
+            raise ValueError('empty period_range')
+
+        members = self.__members(students)
+        bits = (self.__occupancies()[members, None] >> np.arange(len(Week) * max_period, dtype=np.uint64)) \
+            & np.uint64(1)
+
+        allowed = np.zeros(len(Week) * max_period, dtype=bool)
+        allowed[[week.value * max_period + period - 1 for week in Week for period in periods]] = True
+        conflicts = np.where(allowed, bits.sum(axis=0), len(members) + 1)
+
+        best = int(np.argmin(conflicts))
+        week, period = divmod(best, max_period)
+        return (Week(week), period + 1), [self.__students[i] for i in members[bits[:, best] == 1]]
+
+    def to_google_cal(self, path: str, combined=False, start: date = term_start, end: date = term_end) -> list[str]:
+        """
+        모든 학생의 구글 캘린더 CSV를 씁니다. `combined`가 아니면 `path` 폴더에 학생마다 `학생의 시간표.csv`를 하나씩,
+        `combined`면 `path` 파일 하나에 맨 앞 `Student` 열을 붙여 이어 씁니다.
+        한 학생씩 만들어서 바로 쓰므로 학년 전체의 표를 메모리에 한꺼번에 들고 있지 않습니다. 쓴 파일 경로들을 돌려줍니다.
+        """
+
+        if combined:
+            with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+                for i, student in enumerate(self.__students):
+                    df = student.get_google_cal(start, end)
+                    df.insert(0, 'Student', str(student))
+                    df.to_csv(f, header=i == 0, index=False)
+            return [path]
+
+        os.makedirs(path, exist_ok=True)
+        paths = []
+        for student in self.__students:
+            paths.append(os.path.join(path, f"{student}의 시간표.csv"))
+            student.get_google_cal(start, end).to_csv(paths[-1], index=False, encoding='utf-8-sig')
+        return paths
+
+    def to_images(self, path: str, workers: int = None, font: str = None) -> list[str]:
+        """
+        모든 학생의 시간표 그림을 `path` 폴더에 `학생의 시간표.png`로 저장합니다. 그리기와 PNG 압축은 스레드 풀에서 나눠서 하고,
+        저장한 파일 경로들을 학생 순서대로 돌려줍니다. `font`는 `Timetable.to_image`와 같습니다.
+        """
+
+        image_font(font)  # 한글 글꼴이 없으면 그리기 전에 바로 실패함
+        os.makedirs(path, exist_ok=True)
+
+        def render(student: Student) -> str:
+            file = os.path.join(path, f"{student}의 시간표.png")
+            student.get_image(font).save(file)
+            return file
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(render, self.__students))
+
+    def overlap_matrix(self) -> np.ndarray:
+        """
+        학생 × 학생 겹치는 시수 행렬을 돌려줍니다. `matrix[i, j]`는 i번째 학생과 j번째 학생이 같이 듣는 분반들의 시수 합입니다.
+        학생 × 분반 행렬에 시수를 곱해서 행렬곱 한 번으로 계산하고, 학생이 바뀔 때까지 캐시해 둡니다.
+        """
+
+        if self.__overlap is not None:
+            return self.__overlap
+
+        sections: dict[Subject, int] = {}
+        rows, columns = [], []
+        for i, student in enumerate(self.__students):
+            for subject in student.classes:
+                rows.append(i)
+                columns.append(sections.setdefault(subject, len(sections)))
+
+        incidence = np.zeros((len(self.__students), len(sections)), dtype=np.int32)
+        incidence[rows, columns] = 1
+
+        times = np.zeros(len(sections), dtype=np.int32)
+        for subject, j in sections.items():
+            times[j] = subject.time
+
+        self.__overlap = (incidence * times) @ incidence.T
+        return self.__overlap
+
+    def overlap_pairs(self, threshold: int, matrix: np.ndarray = None) -> list[tuple[Student, Student, int]]:
+        """
+        겹치는 시수가 `threshold` 이상인 (학생1, 학생2, 시수) 쌍들을 학생 순서대로 돌려줍니다. 같은 쌍은 한 번만 나옵니다.
+        """
+
+        if matrix is None:
+            matrix = self.overlap_matrix()
+
+        return [(self.__students[i], self.__students[j], int(matrix[i, j]))
+                for i, j in np.argwhere(np.triu(matrix >= threshold, k=1))]
+
+    @staticmethod
+    def __select(scores: np.ndarray, k: int) -> np.ndarray:
+        """
+        `scores`의 각 행에서 점수가 큰 `k`개 열 번호를 큰 순서대로 고릅니다. 전체를 정렬하지 않고 argpartition으로
+        `k`개만 고른 다음 그것만 정렬합니다. 점수가 같으면 앞 열이 먼저 오도록 열 번호를 키에 섞어 둡니다.
+        """
+
+        n = scores.shape[1]
+        k = min(k, n)
+        if k <= 0:
+            return np.empty((len(scores), 0), dtype=np.intp)
+
+        keys = scores.astype(np.int64) * n + (n - 1 - np.arange(n))
+        candidates = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(keys, candidates, axis=1), axis=1)
+
+        return np.take_along_axis(candidates, order, axis=1)
+
+    def __rankings(self, i: int, row: np.ndarray, scores: np.ndarray) -> list['Ranking']:
+        student = self.__students[i]
+        return [Ranking(target=self.__students[j], subjects=student & self.__students[j], score=int(scores[j]))
+                for j in row if j != i]
+
+    def top_overlaps(self, student: int | str | tuple[int, str] | Student, k: int = 5) -> list['Ranking']:
+        """
+        `student`와 가장 많이 겹치는 다른 학생 `k`명을 시수가 큰 순서대로 돌려줍니다. 시수가 같으면 학생 순서대로입니다.
+        """
+
+        student = self[student]
+        if student is None:
+            return []
+
+        i = self.__position(student)
+        scores = self.overlap_matrix()[i].copy()
+        scores[i] = -1  # 자기 자신은 맨 뒤로
+
+        return self.__rankings(i, self.__select(scores[np.newaxis], k + 1)[0], scores)[:k]
+
+    def top_overlaps_all(self, k: int = 5) -> dict[Student, list['Ranking']]:
+        """
+        모든 학생에 대해 `top_overlaps`를 한 번에 구합니다.
+        """
+
+        scores = self.overlap_matrix().copy()
+        np.fill_diagonal(scores, -1)  # 자기 자신은 맨 뒤로
+        selected = self.__select(scores, k + 1)
+
+        return {student: self.__rankings(i, selected[i], scores[i])[:k] for i, student in enumerate(self.__students)}
+
 @dataclass
 class Ranking:
     target: Student
@@ -7,7 +7,8 @@ from openpyxl.utils import get_column_letter
 
 students = StudentList.load(
     '../data/2학년 학생별 시간표.xlsx',
-    '../data/과목별 다교사수업.xlsx')
+    '../data/과목별 다교사수업.xlsx',
+    cache_dir=default_cache_dir)
 
 records: defaultdict[Subject, defaultdict[str, StudentList]] \
     = defaultdict(lambda: defaultdict(StudentList))
@@ -40,15 +41,8 @@ def classes(sheet):
 def overlap_each_other(sheet):
     overlaps = defaultdict(set)
 
-    for student1 in students:
-        for student2 in students:
-            if student1 == student2:
-                continue
-
-            overlap = student1.classes & student2.classes
-
-            if sum(overlap.to_time()) >= 20:
-                overlaps[sum(overlap.to_time())].add(frozenset([student1, student2]))
+    for student1, student2, time in students.overlap_pairs(20):
+        overlaps[time].add(frozenset([student1, student2]))
 
     r = 1
     for time in sorted(overlaps.keys(), reverse=True):
@@ -62,24 +56,14 @@ def overlap_each_other(sheet):
         r += 1
 
 def overlap_each(sheet):
-    for i, student in enumerate(students, start=1):
-        ranking = []
-
-        for other in students:
-            if student == other:
-                continue
-
-            overlap = student.classes & other.classes
-            ranking.append((other, sum(overlap.to_time())))
-
-        ranking.sort(key=lambda x: x[1], reverse=True)
-        ranking = ranking[:5]
+    rankings = students.top_overlaps_all(5)
 
+    for i, student in enumerate(students, start=1):
         sheet.cell(row=i, column=1, value=student.name)
         sheet.cell(row=i, column=1).font = Font(bold=True)
 
-        for j, (other, time) in enumerate(ranking):
-            sheet.cell(row=i, column=j + 2, value=f"{other.name} ({time}시수)")
+        for j, ranking in enumerate(rankings[student]):
+            sheet.cell(row=i, column=j + 2, value=f"{ranking.target.name} ({ranking.score}시수)")
             sheet.column_dimensions[get_column_letter(j + 2)].width = 15
 
 classes(workbook.create_sheet('분반'))
@@ -0,0 +1,89 @@
+import os
+import pickle
+import shutil
+import zipfile
+
+from src.timetable import *
+
+def test_read_cache_missing_file(tmp_path):
+    assert StudentList.read_cache(str(tmp_path / 'none.pickle')) is None
+
+def test_read_cache_ignores_broken_files(tmp_path):
+    path = tmp_path / 'cache.pickle'
+
+    broken = [
+        b'not a pickle',
+        b'',
+        pickle.dumps(StudentList())[:-3],  # 중간에 끊긴 파일
+        b'\x80\x04\x95\x1a\x00\x00\x00\x00\x00\x00\x00\x8c\x03src\x94\x8c\x0bStudentList\x94\x93\x94.',  # 없는 모듈
+        b'cnosuchmodule\nStudentList\n)R.',
+        b'cbuiltins\nint\n(S"x"\ntR.',  # 불러오는 중 TypeError/ValueError
+    ]
+    for content in broken:
+        path.write_bytes(content)
+        assert StudentList.read_cache(str(path)) is None, content
+
+def test_read_cache_rejects_other_objects(tmp_path):
+    path = tmp_path / 'cache.pickle'
+
+    path.write_bytes(pickle.dumps({'students': []}))
+    assert StudentList.read_cache(str(path)) is None
+
+    path.write_bytes(pickle.dumps([1, 2, 3]))
+    assert StudentList.read_cache(str(path)) is None
+
+def test_write_then_read_cache(tmp_path):
+    path = str(tmp_path / 'sub' / 'cache.pickle')
+    students = StudentList([Student(22001, '가', Timetable(pool=ClassPool()), ClassSet(pool=ClassPool()))])
+
+    StudentList.write_cache(path, students)
+    cached = StudentList.read_cache(path)
+
+    assert isinstance(cached, StudentList)
+    assert [(e.id, e.name) for e in cached] == [(22001, '가')]
+
+def test_load_rebuilds_broken_cache(tmp_path, timetable_path, subject_path):
+    cache_dir = str(tmp_path)
+    key = StudentList.cache_key(timetable_path, subject_path)
+    path = os.path.join(cache_dir, f'{key}.pickle')
+
+    with open(path, 'wb') as f:
+        f.write(b'cnosuchmodule\nStudentList\n)R.')
+
+    students = StudentList.load(timetable_path, subject_path, cache_dir=cache_dir)
+    assert len(students) > 0
+    assert isinstance(StudentList.read_cache(path), StudentList)  # 새로 만든 캐시로 바뀜
+
+    again = StudentList.load(timetable_path, subject_path, cache_dir=cache_dir)
+    assert [(e.id, e.name) for e in again] == [(e.id, e.name) for e in students]
+
+def test_cache_key_follows_inputs(timetable_path, subject_path):
+    key = StudentList.cache_key(timetable_path, subject_path)
+
+    assert key == StudentList.cache_key(timetable_path, subject_path)
+    assert key != StudentList.cache_key(timetable_path, subject_path, grade=1)
+    assert key != StudentList.cache_key(timetable_path, subject_path, semester=1)
+
+def test_changed_workbook_is_parsed_again(tmp_path, monkeypatch, timetable_path, subject_path):
+    cache_dir = str(tmp_path / 'cache')
+    copy = tmp_path / 'timetable.xlsx'
+    shutil.copyfile(timetable_path, copy)
+
+    parsed = []
+    parse_grade = StudentList.parse_grade
+    monkeypatch.setattr(StudentList, 'parse_grade',
+                        staticmethod(lambda *args, **kwargs: parsed.append(1) or parse_grade(*args, **kwargs)))
+
+    key = StudentList.cache_key(str(copy), subject_path)
+    students = StudentList.load(str(copy), subject_path, cache_dir=cache_dir)
+    StudentList.load(str(copy), subject_path, cache_dir=cache_dir)
+    assert len(parsed) == 1
+
+    # 내용은 그대로 두고 zip에 항목만 하나 더해서 파일 바이트를 바꿈
+    with zipfile.ZipFile(copy, 'a') as archive:
+        archive.writestr('customXml/note.xml', '<note/>')
+
+    assert StudentList.cache_key(str(copy), subject_path) != key
+    again = StudentList.load(str(copy), subject_path, cache_dir=cache_dir)
+    assert len(parsed) == 2
+    assert [(e.id, e.name) for e in again] == [(e.id, e.name) for e in students]
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from src.timetable import *
+
+@pytest.fixture
+def restore_classify():
+    table = classify.table
+    yield classify
+    classify.configure(table)
+
+def test_default_table():
+    classifier = SubjectClassifier(subject_keywords)
+
+    assert classifier('일반물리학I') == SubjectType.물리학
+    assert classifier('물리화학') == SubjectType.물리학  # 앞에 있는 분류가 우선
+    assert classifier('생화학') == SubjectType.화학
+    assert classifier('미적분학I') == SubjectType.수학
+    assert classifier('머신러닝과딥러닝') == SubjectType.정보과학
+    assert classifier('진로') == SubjectType.교양
+
+def test_priority_is_by_table_order_not_position():
+    classifier = SubjectClassifier([(SubjectType.수학, ['수학']), (SubjectType.정보과학, ['정보'])])
+
+    assert classifier('정보수학') == SubjectType.수학
+    assert SubjectClassifier([])('정보수학') == SubjectType.교양
+
+def test_configure_clears_cache():
+    classifier = SubjectClassifier(subject_keywords)
+    assert classifier('일반물리학I') == SubjectType.물리학
+
+    classifier.configure([(SubjectType.교양, ['물리'])])
+    assert classifier('일반물리학I') == SubjectType.교양
+
+def test_read_table(tmp_path):
+    path = tmp_path / 'keywords.json'
+    path.write_text(json.dumps({'화학': ['물리'], '물리학': ['역학']}, ensure_ascii=False), encoding='utf-8')
+
+    classifier = SubjectClassifier(SubjectClassifier.read_table(str(path)))
+    assert classifier('물리역학') == SubjectType.화학
+
+def test_digest_follows_table():
+    assert SubjectClassifier(subject_keywords).digest() == SubjectClassifier(subject_keywords).digest()
+    assert SubjectClassifier(subject_keywords).digest() != SubjectClassifier(subject_keywords[:-1]).digest()
+    assert SubjectClassifier(subject_keywords).digest() != \
+        SubjectClassifier(subject_keywords, default=SubjectType.인문).digest()
+
+def test_changed_table_misses_cache(tmp_path, restore_classify, timetable_path, subject_path):
+    cache_dir = str(tmp_path)
+    before = StudentList.load(timetable_path, subject_path, cache_dir=cache_dir)
+    key = StudentList.cache_key(timetable_path, subject_path)
+    assert any(subject.type != SubjectType.교양 for e in before for subject in e.classes)
+
+    classify.configure([])
+    assert StudentList.cache_key(timetable_path, subject_path) != key
+
+    after = StudentList.load(timetable_path, subject_path, cache_dir=cache_dir)
+    assert all(subject.type == SubjectType.교양 for e in after for subject in e.classes)
@@ -0,0 +1,96 @@
+import pytest
+
+from src.timetable import *
+
+def make_subjects(pool: ClassPool):
+    return [pool.intern_subject(name, time, nth) for name, time, nth in
+            [('미적분학I', 4, 1), ('일반물리학I', 3, 1), ('일반화학I', 3, 2), ('국어', 2, 1)]]
+
+def names(classes: ClassSet) -> list[str]:
+    return [subject.name for subject in classes]
+
+def test_operators_match_python_sets():
+    pool = ClassPool()
+    math, physics, chemistry, korean = make_subjects(pool)
+    a = ClassSet({math, physics, chemistry}, pool=pool)
+    b = ClassSet({physics, korean}, pool=pool)
+
+    assert set(a | b) == {math, physics, chemistry, korean}
+    assert set(a & b) == {physics}
+    assert set(a ^ b) == {math, chemistry, korean}
+    assert set(a - b) == {math, chemistry}
+    assert set(b - a) == {korean}
+
+def test_operators_do_not_modify_operands():
+    pool = ClassPool()
+    math, physics, chemistry, _ = make_subjects(pool)
+    a = ClassSet({math, physics}, pool=pool)
+    b = ClassSet({physics, chemistry}, pool=pool)
+
+    a | b
+    a - b
+    assert set(a) == {math, physics}
+    assert set(b) == {physics, chemistry}
+
+def test_iterates_in_section_order():
+    pool = ClassPool()
+    math, physics, chemistry, korean = make_subjects(pool)
+
+    assert names(ClassSet({korean, math, chemistry, physics}, pool=pool)) == ['미적분학I', '일반물리학I', '일반화학I', '국어']
+
+def test_len_and_total_time():
+    pool = ClassPool()
+    math, physics, chemistry, korean = make_subjects(pool)
+    classes = ClassSet({math, physics, korean}, pool=pool)
+
+    assert len(classes) == 3
+    assert classes.total_time() == 4 + 3 + 2
+    assert ClassSet(pool=pool).total_time() == 0
+    assert sorted(classes.to_time()) == [2, 3, 4]
+
+def test_subject_operand_and_add():
+    pool = ClassPool()
+    math, physics, _, _ = make_subjects(pool)
+    classes = ClassSet(math, pool=pool)
+
+    assert set(classes | physics) == {math, physics}
+    assert set(classes & physics) == set()
+    classes.add(physics)
+    assert set(classes) == {math, physics}
+
+def test_operands_from_another_pool_are_mapped():
+    pool, other_pool = ClassPool(), ClassPool()
+    math, physics, _, _ = make_subjects(pool)
+    _, other_physics, other_chemistry, _ = make_subjects(other_pool)
+
+    mine = ClassSet({math, physics}, pool=pool)
+    theirs = ClassSet({other_physics, other_chemistry}, pool=other_pool)
+
+    assert names(mine & theirs) == ['일반물리학I']
+    assert sorted(names(mine | theirs)) == ['미적분학I', '일반물리학I', '일반화학I']
+
+def test_student_operators():
+    pool = ClassPool()
+    math, physics, chemistry, korean = make_subjects(pool)
+    me = Student(22001, '가', Timetable(pool=pool), ClassSet({math, physics}, pool=pool))
+    you = Student(22002, '나', Timetable(pool=pool), ClassSet({physics, chemistry}, pool=pool))
+
+    assert set(me & you) == {physics}
+    assert set(me | you) == {math, physics, chemistry}
+    assert set(me - you) == {math}
+    assert set(me ^ you) == {math, chemistry}
+    assert set(me | korean) == {math, physics, korean}
+    assert set(me & physics) == {physics}
+
+def test_find():
+    pool = ClassPool()
+    math, physics, chemistry, _ = make_subjects(pool)
+    classes = ClassSet({math, physics, chemistry}, pool=pool)
+
+    assert classes.find('일반') is physics
+    assert classes.find('일반', nth=2) is chemistry
+    assert classes.find('국어') is None
+
+def test_unsupported_operand():
+    with pytest.raises(TypeError):
+        ClassSet(pool=ClassPool()) | 3
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from src.timetable import *
+
+def brute_free(students: list[Student], periods) -> list[tuple[Week, int]]:
+    return [(week, period) for week in Week for period in periods
+            if all(e.timetable[week][period].value() == GAP for e in students)]
+
+def test_free_periods_of_group(make_students):
+    students = make_students({1: [('월', 1), ('월', 2)], 2: [('월', 2), ('화', 1)], 3: [('수', 3)]})
+    periods = range(1, 3)
+
+    assert students.free_periods(['학생1', '학생2'], periods) == [
+        (Week.TUE, 2), (Week.WED, 1), (Week.WED, 2), (Week.THU, 1), (Week.THU, 2), (Week.FRI, 1), (Week.FRI, 2)]
+    assert students.free_periods([], periods) == [(week, period) for week in Week for period in periods]
+    assert len(students.free_periods()) == len(Week) * max_period - 4
+
+def test_free_periods_matches_brute_force(make_students):
+    random.seed(0)
+    cells = [(week, period) for week in ['월', '화', '수', '목', '금'] for period in range(1, max_period + 1)]
+    students = make_students({22000 + i: random.sample(cells, 20) for i in range(30)})
+
+    for n in (1, 2, 5, 30):
+        group = random.sample(list(students), n)
+        assert students.free_periods(group) == brute_free(group, range(1, max_period + 1))
+
+def test_least_busy_period(make_students):
+    students = make_students({1: [('월', 1)], 2: [('월', 1), ('월', 2)], 3: [('월', 2)]})
+
+    slot, busy = students.least_busy_period(period_range=range(1, 3))
+    assert slot == (Week.TUE, 1)
+    assert busy == []
+
+    everyone_but_tuesday = make_students({id: [(week, p) for week in ['월', '수', '목', '금'] for p in (1, 2)]
+                                          + ([('화', 1)] if id < 3 else []) for id in range(1, 5)})
+    slot, busy = everyone_but_tuesday.least_busy_period(period_range=range(1, 3))
+    assert slot == (Week.TUE, 2)
+    assert busy == []
+
+    slot, busy = everyone_but_tuesday.least_busy_period(period_range=range(1, 2))
+    assert slot == (Week.TUE, 1)
+    assert [e.id for e in busy] == [1, 2]
+
+def test_duplicate_members_count_once(make_students):
+    students = make_students({1: [('월', p) for p in range(1, max_period + 1)], 2: [('화', 1)]})
+    everyone_else = [(week, p) for week in ['화', '수', '목', '금'] for p in range(1, max_period + 1)]
+    students.append(make_students({3: everyone_else})['학생3'])
+
+    # 1번 학생을 여러 번 넣어도 월요일이 3번 학생 한 명과 같은 무게로 세어짐
+    slot, busy = students.least_busy_period(['학생1', '학생1', '학생1', '학생3'])
+    assert slot == (Week.MON, 1)
+    assert [e.id for e in busy] == [1]
+
+def test_invalid_period_range(make_students):
+    students = make_students({1: [('월', 1)]})
+
+    with pytest.raises(ValueError):
+        students.least_busy_period(period_range=range(9, 9))
+    with pytest.raises(ValueError):
+        students.free_periods(period_range=range(0, 2))
+    with pytest.raises(ValueError):
+        students.least_busy_period(period_range=range(1, max_period + 2))
+    assert students.free_periods(period_range=range(9, 9)) == []
+
+def test_unknown_student(make_students):
+    students = make_students({1: [('월', 1)]})
+
+    with pytest.raises(KeyError):
+        students.free_periods(['없는학생'])
+
+def test_occupancy_follows_changes(make_students):
+    students = make_students({1: [('월', 1)]})
+    assert (Week.MON, 2) in students.free_periods(['학생1'])
+
+    changed = make_students({1: [('월', 2)]})['학생1']
+    students['학생1'] = changed
+    assert (Week.MON, 1) in students.free_periods(['학생1'])
+    assert (Week.MON, 2) not in students.free_periods(['학생1'])
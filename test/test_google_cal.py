@@ -0,0 +1,67 @@
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from src.timetable import *
+
+@pytest.fixture
+def students(make_students) -> StudentList:
+    return make_students({
+        22001: [('월', 1), ('월', 2), ('수', 5)],
+        22002: [('화', 3)],
+        22003: [],
+    })
+
+def read(path: str) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+
+def expected(student: Student, start: date = term_start, end: date = term_end) -> pd.DataFrame:
+    return student.get_google_cal(start, end).astype(str).reset_index(drop=True)
+
+def test_one_file_per_student(tmp_path, students):
+    paths = students.to_google_cal(str(tmp_path / 'cal'))
+
+    assert paths == [os.path.join(tmp_path, 'cal', f'{e}의 시간표.csv') for e in students]
+    for student, path in zip(students, paths):
+        pd.testing.assert_frame_equal(read(path), expected(student))
+
+def test_combined_file(tmp_path, students):
+    path = str(tmp_path / 'all.csv')
+    assert students.to_google_cal(path, combined=True) == [path]
+
+    with open(path, encoding='utf-8-sig') as f:
+        lines = f.read().splitlines()
+    assert lines[0] == ','.join(['Student'] + google_cal_columns)
+    assert lines.count(lines[0]) == 1
+
+    combined = read(path)
+    for student in students:
+        rows = combined[combined['Student'] == str(student)].drop(columns='Student').reset_index(drop=True)
+        pd.testing.assert_frame_equal(rows, expected(student))
+    assert len(combined) == sum(len(student.get_google_cal()) for student in students)
+
+def test_term_bounds(tmp_path, students):
+    start, end = term_start, term_start + timedelta(weeks=2)
+    path = str(tmp_path / 'all.csv')
+    students.to_google_cal(path, combined=True, start=start, end=end)
+
+    combined = read(path)
+    first = students[0]
+    rows = combined[combined['Student'] == str(first)].drop(columns='Student').reset_index(drop=True)
+    pd.testing.assert_frame_equal(rows, expected(first, start, end))
+    assert len(rows) == 2 * len(list(first.timetable.blocks()))  # 월 1~2교시, 수 5교시가 두 주
+    assert set(rows['Start Date']) == {'08/14/2023', '08/16/2023', '08/21/2023', '08/23/2023'}
+
+def test_empty_term(tmp_path, students):
+    path = str(tmp_path / 'all.csv')
+    students.to_google_cal(path, combined=True, start=term_start, end=term_start)
+
+    combined = read(path)
+    assert combined.empty
+    assert list(combined.columns) == ['Student'] + google_cal_columns
+
+    for file in students.to_google_cal(str(tmp_path / 'cal'), start=term_start, end=term_start):
+        assert read(file).empty
+        assert list(read(file).columns) == google_cal_columns
@@ -0,0 +1,82 @@
+import pytest
+
+from src.timetable import *
+
+@pytest.fixture
+def make_student(make_classes):
+    def make(id: int, name: str) -> Student:
+        pool = ClassPool()
+        math, physics = make_classes(pool, '본 101, 2층')
+
+        timetable = Timetable(pool=pool)
+        timetable['월', 1] = math
+        timetable['월', 2] = math
+        timetable['수', 5] = physics
+        return Student(id, name, timetable, ClassSet(pool=pool))
+
+    return make
+
+def unfold(text: str) -> list[str]:
+    return text.replace('\r\n ', '').split('\r\n')[:-1]
+
+def events(text: str) -> list[dict[str, str]]:
+    found, current = [], None
+    for line in unfold(text):
+        if line == 'BEGIN:VEVENT':
+            current = {}
+        elif line == 'END:VEVENT':
+            found.append(current)
+            current = None
+        elif current is not None:
+            key, value = line.split(':', 1)
+            current[key] = value
+    return found
+
+def test_one_event_per_block(make_student):
+    text = make_student(22001, '가').get_ics()
+    found = events(text)
+
+    assert text.startswith('BEGIN:VCALENDAR\r\n') and text.endswith('END:VCALENDAR\r\n')
+    assert [(e['DTSTART;TZID=Asia/Seoul'], e['DTEND;TZID=Asia/Seoul']) for e in found] == [
+        ('20230814T085000', '20230814T104000'),  # 1, 2교시 연강
+        ('20230816T133000', '20230816T142000'),
+    ]
+    assert all(e['RRULE'] == 'FREQ=WEEKLY;UNTIL=20231230T145959Z' for e in found)
+    assert found[0]['SUMMARY'] == '미적분학I'
+    assert found[0]['LOCATION'] == '본 101\\, 2층'
+    assert found[0]['DESCRIPTION'] == '김선생T 1분반'
+
+def test_same_name_students_get_distinct_uids(make_student):
+    first = {e['UID'] for e in events(make_student(22001, '동명').get_ics())}
+    second = {e['UID'] for e in events(make_student(22002, '동명').get_ics())}
+
+    assert len(first) == 2 and len(second) == 2
+    assert not first & second
+
+def test_term_bounds(make_student):
+    student = make_student(22001, '가')
+
+    # 수요일 첫 수업이 끝 날짜 이후면 일정에서 빠짐
+    found = events(student.get_ics(start=date(2023, 8, 14), end=date(2023, 8, 15)))
+    assert [e['SUMMARY'] for e in found] == ['미적분학I']
+    assert found[0]['RRULE'] == 'FREQ=WEEKLY;UNTIL=20230814T145959Z'
+
+def test_lines_are_folded_and_escaped():
+    assert ics_escape('a;b,c\\d\ne') == r'a\;b\,c\\d\ne'
+
+    long = 'SUMMARY:' + '가' * 40
+    folded = ics_fold(long)
+    assert all(len(line.encode('utf-8')) <= 75 for line in folded.split('\r\n'))
+    assert folded.replace('\r\n ', '') == long
+
+def test_class_without_teacher():
+    pool = ClassPool()
+    subject = pool.intern_subject('자율학습', 1, 3, ())
+
+    timetable = Timetable(pool=pool)
+    timetable['월', 1] = Class(subject)
+    found = events(Student(22001, '가', timetable, ClassSet(pool=pool)).get_ics())
+
+    assert len(found) == 1
+    assert 'LOCATION' not in found[0]
+    assert found[0]['DESCRIPTION'] == '3분반'
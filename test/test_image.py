@@ -0,0 +1,59 @@
+import os
+
+import pytest
+from PIL import ImageFont
+
+import src.timetable
+from src.timetable import *
+
+def test_has_glyph():
+    font = ImageFont.truetype('DejaVuSans.ttf', image_font_size)
+
+    assert has_glyph(font, 'A')
+    assert not has_glyph(font, '가')
+
+def test_font_without_hangul_is_rejected():
+    with pytest.raises(OSError, match='TIMETABLE_FONT'):
+        image_font('DejaVuSans.ttf', size=11)
+
+def test_missing_fonts_raise(monkeypatch):
+    monkeypatch.setattr(src.timetable, 'image_fonts', ['no-such-font.ttf', 'DejaVuSans.ttf'])
+    monkeypatch.delenv('TIMETABLE_FONT', raising=False)
+
+    with pytest.raises(OSError):
+        image_font(size=12)
+
+def test_to_images_fails_before_writing(monkeypatch, tmp_path):
+    monkeypatch.setattr(src.timetable, 'image_fonts', [])
+    monkeypatch.delenv('TIMETABLE_FONT', raising=False)
+    students = StudentList([Student(22001, '가', Timetable(pool=ClassPool()), ClassSet(pool=ClassPool()))])
+
+    with pytest.raises(OSError):
+        students.to_images(str(tmp_path / 'out'))
+    assert not (tmp_path / 'out').exists()
+
+def test_layout_and_colors(monkeypatch, tmp_path):
+    # 이 환경에는 한글 글꼴이 없을 수 있으므로 글자 확인은 건너뛰고 배치와 색만 확인함
+    monkeypatch.setattr(src.timetable, 'has_glyph', lambda font, char: True)
+    font = ImageFont.truetype('DejaVuSans.ttf', image_font_size).path
+
+    pool = ClassPool()
+    teacher = pool.intern_teacher('김선생', '본 101')
+    math = pool.intern_class(pool.intern_subject('미적분학I', 4, 1, (teacher,)), teacher)
+    timetable = Timetable(pool=pool)
+    timetable['화', 2] = math
+    timetable['화', 3] = math
+
+    image = timetable.to_image(font)
+    assert image.size == image_size
+
+    x = period_width + Week.TUE.value * default_width + 6
+    hex_color = lambda xy: '#%02x%02x%02x' % image.getpixel(xy)
+    assert hex_color((x, week_height + default_height + 6)) == math.super.type.color[0].lower()
+    assert hex_color((x, week_height + 3 * default_height - 6)) == math.super.type.color[0].lower()  # 연강은 한 블록
+    assert hex_color((x, week_height + 6)) == '#fafafa'
+    assert hex_color((2, 2)) == '#eeeeee'
+
+    students = StudentList([Student(22001, '가', timetable, ClassSet(pool=pool))])
+    paths = students.to_images(str(tmp_path), workers=2, font=font)
+    assert [os.path.basename(p) for p in paths] == ['22001 가의 시간표.png']
@@ -0,0 +1,73 @@
+import random
+
+from src.timetable import *
+
+def make_students(pool: ClassPool, classes: dict[int, list[int]], subjects: list[Subject]) -> StudentList:
+    return StudentList(Student(id, f'학생{id}', Timetable(pool=pool), ClassSet({subjects[i] for i in picked}, pool=pool))
+                       for id, picked in classes.items())
+
+def brute_scores(students: StudentList, student: Student) -> list[tuple[Student, int]]:
+    return [(other, sum(subject.time for subject in student.classes if subject in set(other.classes)))
+            for other in students if other is not student]
+
+def test_overlap_matrix_is_shared_hours():
+    pool = ClassPool()
+    subjects = [pool.intern_subject(f'과목{i}', i + 1, 1) for i in range(4)]
+    students = make_students(pool, {1: [0, 1], 2: [1, 2], 3: [0, 1, 3]}, subjects)
+
+    matrix = students.overlap_matrix()
+    assert matrix.tolist() == [[1 + 2, 2, 1 + 2],
+                               [2, 2 + 3, 2],
+                               [1 + 2, 2, 1 + 2 + 4]]
+
+def test_top_overlaps_breaks_ties_by_student_order():
+    pool = ClassPool()
+    subjects = [pool.intern_subject(f'과목{i}', 2, 1) for i in range(3)]
+    # 1번과 겹치는 시수: 5번 4, 2·3·4번 2, 6번 0
+    students = make_students(pool, {1: [0, 1], 4: [0], 2: [1], 6: [2], 5: [0, 1], 3: [0, 2]}, subjects)
+
+    ranking = students.top_overlaps('학생1', k=4)
+    assert [(r.target.id, r.score) for r in ranking] == [(5, 4), (2, 2), (3, 2), (4, 2)]
+    assert set(ranking[0].subjects) == {subjects[0], subjects[1]}
+
+def test_top_overlaps_excludes_self_and_caps_k():
+    pool = ClassPool()
+    subjects = [pool.intern_subject(f'과목{i}', 1, 1) for i in range(2)]
+    students = make_students(pool, {1: [0], 2: [0], 3: [1]}, subjects)
+
+    ranking = students.top_overlaps('학생2', k=10)
+    assert [r.target.id for r in ranking] == [1, 3]
+    assert [r.score for r in ranking] == [1, 0]
+    assert students.top_overlaps('학생99') == []
+
+def test_top_overlaps_matches_brute_force():
+    random.seed(0)
+    pool = ClassPool()
+    subjects = [pool.intern_subject(f'과목{i}', random.randint(1, 4), 1) for i in range(12)]
+    students = make_students(pool, {22000 + i: random.sample(range(12), 5) for i in range(40)}, subjects)
+
+    everyone = students.top_overlaps_all(k=5)
+    for student in students:
+        expected = sorted(brute_scores(students, student), key=lambda x: (-x[1], x[0].id))[:5]
+        got = [(r.target, r.score) for r in students.top_overlaps(student, k=5)]
+
+        assert got == expected
+        assert [(r.target, r.score) for r in everyone[student]] == expected
+
+def test_overlap_pairs():
+    pool = ClassPool()
+    subjects = [pool.intern_subject(f'과목{i}', 3, 1) for i in range(3)]
+    students = make_students(pool, {1: [0, 1], 2: [0, 1], 3: [1, 2], 4: [2]}, subjects)
+
+    pairs = [(a.id, b.id, hours) for a, b, hours in students.overlap_pairs(3)]
+    assert pairs == [(1, 2, 6), (1, 3, 3), (2, 3, 3), (3, 4, 3)]
+    assert [(a.id, b.id) for a, b, _ in students.overlap_pairs(6)] == [(1, 2)]
+
+def test_overlap_cache_follows_changes():
+    pool = ClassPool()
+    subjects = [pool.intern_subject(f'과목{i}', 2, 1) for i in range(2)]
+    students = make_students(pool, {1: [0], 2: [1]}, subjects)
+
+    assert students.top_overlaps('학생1')[0].score == 0
+    students.append(Student(3, '학생3', Timetable(pool=pool), ClassSet(subjects[0], pool=pool)))
+    assert [(r.target.id, r.score) for r in students.top_overlaps('학생1')] == [(3, 2), (2, 0)]
@@ -0,0 +1,167 @@
+import threading
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from src.timetable import *
+
+def snapshot(students: StudentList):
+    return [(e.id, e.name, [(key, str(value)) for key, value in e.timetable.items()], sorted(e.classes.to_str()))
+            for e in students]
+
+@pytest.fixture(scope='module')
+def serial(timetable_path, subject_path):
+    return StudentList.parse(timetable_path, subject_path)
+
+def test_workers_match_serial(serial, timetable_path, subject_path):
+    parallel = StudentList.parse(timetable_path, subject_path, workers=2, chunk_size=8)
+    assert snapshot(parallel) == snapshot(serial)
+
+def test_lazy_matches_serial(serial, timetable_path, subject_path):
+    lazy = StudentList.parse(timetable_path, subject_path, lazy=True, workers=2)
+    assert all(isinstance(e, LazyStudent) and not e.loaded for e in lazy)
+    assert snapshot(lazy) == snapshot(serial)
+
+def counting_blocks(monkeypatch) -> list[int]:
+    read = [0]
+    read_blocks = StudentList.read_blocks
+
+    def counted(path):
+        for block in read_blocks(path):
+            read[0] += 1
+            yield block
+    monkeypatch.setattr(StudentList, 'read_blocks', staticmethod(counted))
+    return read
+
+def test_workers_read_ahead_is_bounded(monkeypatch, serial, timetable_path, subject_path):
+    read = counting_blocks(monkeypatch)
+    workers, chunk_size = 2, 4
+    read_at_first_progress = []
+
+    def progress(done, total):
+        if not read_at_first_progress:
+            read_at_first_progress.append(read[0])
+
+    StudentList.parse(timetable_path, subject_path, workers=workers, chunk_size=chunk_size, progress=progress)
+
+    assert read[0] == len(serial)
+    assert read_at_first_progress[0] <= (workers * 2 + 1) * chunk_size < len(serial)
+
+def test_workers_cancel_stops_reading(monkeypatch, serial, timetable_path, subject_path):
+    read = counting_blocks(monkeypatch)
+    cancel = threading.Event()
+
+    with pytest.raises(LoadCancelled):
+        StudentList.parse(timetable_path, subject_path, workers=2, chunk_size=4,
+                          progress=lambda done, total: cancel.set(), cancel=cancel)
+
+    assert read[0] < len(serial)
+
+def test_serial_cancel(timetable_path, subject_path):
+    cancel = threading.Event()
+
+    with pytest.raises(LoadCancelled):
+        StudentList.parse(timetable_path, subject_path, progress=lambda done, total: cancel.set(), cancel=cancel)
+
+@pytest.mark.parametrize('grade', [1, 2, 3])
+def test_index_subjects_of_every_grade(grade, subject_path):
+    classroom_data, teacher_data = StudentList.read_subjects(subject_path)
+    index = StudentList.index_subjects(classroom_data[classroom_data['학년'] == grade],
+                                       teacher_data[teacher_data['학년'].isin([grade, f'{grade}학년'])])
+
+    assert index
+    for name, (teachers, schedule_rows) in index.items():
+        assert all(teacher.name.strip() for teacher in teachers), name
+        assert all(teacher in teachers for teacher, _ in schedule_rows), name
+
+def test_index_subjects_matches_teacher_names_without_spaces():
+    classroom_data = pd.DataFrame([[3, '고급영어회화', '김진아, 원어민', '본 407', '박새별, 원어민', '본 406']],
+                                  columns=['학년', '과목', '교사', '강의실', '교사.1', '강의실.1'])
+    teacher_data = pd.DataFrame([['3학년', '고급영어회화', '박새별,원어민', '2(1분반)', None, None, None, None],
+                                 ['3학년', None, '김진아,원어민', '4(3분반)', None, None, None, None]],
+                                columns=['학년', '교과', '교사명', '월요일', '화요일', '수요일', '목요일', '금요일'])
+
+    teachers, schedule_rows = StudentList.index_subjects(classroom_data, teacher_data)['고급영어회화']
+    assert [teacher.name for teacher, _ in schedule_rows] == ['박새별, 원어민', '김진아, 원어민']
+    assert {teacher for teacher, _ in schedule_rows} == set(teachers)
+
+    teacher_data.loc[1, '교사명'] = '원어민'
+    with pytest.raises(ValueError, match='원어민'):
+        StudentList.index_subjects(classroom_data, teacher_data)
+
+@pytest.fixture
+def grade3_path(tmp_path) -> str:
+    """
+    3학년 학생 한 명의 시간표 파일입니다. 고급영어회화는 두 시트에서 교사 이름의 띄어쓰기가 다릅니다.
+    """
+
+    lines = [[None] * len(Week) for _ in range(max_period)]
+    lines[1][0] = '고급영어회화 1반 (2시간)'  # 박새별, 원어민
+    lines[0][1] = '정보과학과 생활 2반 (2시간)'  # 김은희
+    lines[6][0] = lines[7][0] = '물리세미나 2반 (3시간)'  # 김광식
+    lines[0][2] = '화학세미나 1반 (2시간)'  # 다교사수업 아님
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['30101홍길동', '9 학점'])
+    for line in lines:
+        sheet.append(line)
+
+    path = tmp_path / '3학년 학생별 시간표.xlsx'
+    workbook.save(path)
+    return str(path)
+
+def test_load_grade_3(grade3_path, subject_path):
+    students = StudentList.load(grade3_path, subject_path, grade=3)
+
+    assert [(e.id, e.name) for e in students] == [(30101, '홍길동')]
+    timetable = students[0].timetable
+    assert timetable['월', 2].value().teacher.name == '박새별, 원어민'
+    assert timetable['화', 1].value().teacher.name == '김은희'
+    assert timetable['월', 7].value().teacher.name == timetable['월', 8].value().teacher.name == '김광식'
+    assert timetable['수', 1].value().teacher.name == '이수진'
+
+def test_load_grades_merge(grade3_path, timetable_path, subject_path):
+    paths = {2: timetable_path, 3: grade3_path}
+    split = StudentList.load_grades(paths, subject_path)
+    merged = StudentList.load_grades(paths, subject_path, merge=True)
+
+    assert set(split) == {2, 3}
+    assert all(isinstance(students, StudentList) for students in split.values())
+    assert isinstance(merged, StudentList)
+    assert snapshot(merged) == snapshot(split[2]) + snapshot(split[3])
+    assert merged.search('홍길동')[0].id == 30101
+
+def test_load_grades_reads_subjects_once(monkeypatch, tmp_path, grade3_path, timetable_path, subject_path):
+    read = []
+    read_subjects = StudentList.read_subjects
+    monkeypatch.setattr(StudentList, 'read_subjects',
+                        staticmethod(lambda *args, **kwargs: read.append(1) or read_subjects(*args, **kwargs)))
+
+    paths = {2: timetable_path, 3: grade3_path}
+    cache_dir = str(tmp_path / 'cache')
+    StudentList.load_grades(paths, subject_path, cache_dir=cache_dir)
+    assert len(read) == 1
+
+    StudentList.load_grades(paths, subject_path, cache_dir=cache_dir)
+    assert len(read) == 1  # 모두 캐시에서 불러옴
+
+def test_semesters(timetable_path, subject_path):
+    assert StudentList.semesters(subject_path) == [2]
+    assert StudentList.semesters(timetable_path) == []
+
+def test_teacher_grade_filter(grade3_path, subject_path):
+    classroom_data, teacher_data = StudentList.read_subjects(subject_path)
+    assert set(teacher_data['학년']) == {'2학년', '3학년'}  # 첫 행에만 적힌 학년을 아래로 채움
+
+    expected = snapshot(StudentList.parse_grade(grade3_path, classroom_data, teacher_data, grade=3))
+
+    # 학년이 숫자로 적힌 다교사수업 시트도 같은 학년만 골라냄
+    teacher_data['학년'] = teacher_data['학년'].map(lambda x: int(x.removesuffix('학년')))
+    assert snapshot(StudentList.parse_grade(grade3_path, classroom_data, teacher_data, grade=3)) == expected
+
+    # 다른 학년의 다교사수업 행은 쓰지 않으므로 고급영어회화는 강의실 시트의 첫 교사로 정해짐
+    teacher_data['학년'] = teacher_data['학년'].replace(3, 2)
+    students = StudentList.parse_grade(grade3_path, classroom_data, teacher_data, grade=3)
+    assert students[0].timetable['월', 2].value().teacher.name == '김진아, 원어민'
@@ -0,0 +1,145 @@
+import random
+
+from src.timetable import *
+
+def student(id: int, name: str = None) -> Student:
+    return Student(id, f'학생{id}' if name is None else name, Timetable(pool=ClassPool()), ClassSet(pool=ClassPool()))
+
+def assert_consistent(students: StudentList):
+    """
+    리스트가 학번 순서이고, 학번/이름 색인과 위치 표가 리스트와 맞는지 확인합니다.
+    """
+
+    ids = [e.id for e in students]
+    assert ids == sorted(ids)
+
+    for position, e in enumerate(students):
+        assert students[e.name] is min((x for x in students if x.name == e.name), key=lambda x: x.id)
+        assert (e.id, e.name) in students
+        assert students._StudentList__position(e) == position
+
+    by_id = students._StudentList__by_id
+    by_name = students._StudentList__by_name
+    assert set(by_id) == set(ids)
+    assert sorted(x.id for same in by_name.values() for x in same) == sorted(ids)
+
+def test_append_keeps_id_order():
+    random.seed(0)
+    ids = random.sample(range(22001, 22100), 40)
+    students = StudentList()
+
+    for id in ids:
+        students.append(student(id))
+        assert_consistent(students)
+
+    assert [e.id for e in students] == sorted(ids)
+
+def test_append_duplicate_id_goes_after_equal_ids():
+    first, second, third = student(22002, '가'), student(22002, '나'), student(22002, '다')
+    students = StudentList([student(22001), first, student(22003)])
+
+    students.append(second)
+    students.append(third)
+
+    assert [(e.id, e.name) for e in students] == [(22001, '학생22001'), (22002, '가'), (22002, '나'), (22002, '다'),
+                                                  (22003, '학생22003')]
+    assert students._StudentList__position(third) == 3
+
+def test_extend_then_append():
+    students = StudentList([student(22005), student(22001)])
+
+    students.extend([student(22009), student(22003), student(22007)])
+    assert [e.id for e in students] == [22001, 22003, 22005, 22007, 22009]
+    assert_consistent(students)
+
+    students.append(student(22004))
+    students.append(student(22010))
+    students.append(student(22000))
+    assert [e.id for e in students] == [22000, 22001, 22003, 22004, 22005, 22007, 22009, 22010]
+    assert_consistent(students)
+
+def test_setitem_replaces_and_reindexes():
+    students = StudentList([student(22001), student(22002), student(22003)])
+    students._StudentList__position(students['학생22001'])  # 위치 표를 미리 만들어 둠
+
+    replacement = student(22002, '새이름')
+    students['학생22002'] = replacement
+
+    assert [e.name for e in students] == ['학생22001', '새이름', '학생22003']
+    assert '학생22002' not in students
+    assert students['새이름'] is replacement
+    assert (22002, '새이름') in students
+    assert_consistent(students)
+
+    # 같은 학생으로 다시 바꿔도 위치 표가 깨지지 않음
+    students['새이름'] = replacement
+    assert_consistent(students)
+    assert students._StudentList__position(replacement) == 1
+
+def test_setitem_missing_key_appends():
+    students = StudentList([student(22001), student(22003)])
+
+    students['없는학생'] = student(22002)
+
+    assert [e.id for e in students] == [22001, 22002, 22003]
+    assert_consistent(students)
+
+def test_same_name_lookup_prefers_smallest_id():
+    students = StudentList([student(22003, '동명'), student(22001, '동명'), student(22002)])
+
+    assert students['동명'].id == 22001
+    assert students[(22003, '동명')].id == 22003
+    assert (22002, '동명') not in students
+
+def test_choseong():
+    assert choseong('강산원') == 'ㄱㅅㅇ'
+    assert choseong('까치') == 'ㄲㅊ'
+    assert choseong('힣가') == 'ㅎㄱ'
+    assert choseong('김A1 ㄱ') == 'ㄱA1 ㄱ'  # 한글 음절이 아닌 글자는 그대로
+    assert choseong('') == ''
+
+def test_search_prefixes():
+    students = StudentList([student(22001, '강산원'), student(22002, '강진필'), student(22013, '나나'),
+                            student(22101, '김강')])
+
+    assert [e.id for e in students.search('2200')] == [22001, 22002]
+    assert [e.id for e in students.search('220')] == [22001, 22002, 22013]
+    assert [e.id for e in students.search('강')] == [22001, 22002]  # 이름 중간의 '강'은 맞지 않음
+    assert [e.id for e in students.search('강산')] == [22001]
+    assert [e.id for e in students.search('ㄱㅅ')] == [22001]
+    assert [e.id for e in students.search('ㄱ')] == [22101, 22001, 22002]  # 키 순서: ㄱㄱ, ㄱㅅㅇ, ㄱㅈㅍ
+    assert [e.id for e in students.search('ㄱ ㅈ')] == [22002]  # 공백은 무시
+    assert students.search('ㄴㄴ') == students.search('나') == [students['나나']]
+    assert students.search('3') == []
+    assert StudentList().search('가') == []
+
+def test_search_returns_each_student_once():
+    # 학번, 이름, 초성이 모두 '220'으로 시작함
+    students = StudentList([student(22001, '220'), student(22002, 'ㄱ')])
+
+    assert [e.id for e in students.search('220')] == [22001, 22002]
+    assert [e.id for e in students.search('ㄱ')] == [22002]  # 이름과 초성이 같아도 한 번만
+
+def test_search_limit():
+    students = StudentList([student(id) for id in range(22001, 22011)])
+
+    assert [e.id for e in students.search('220', limit=3)] == [22001, 22002, 22003]
+    assert len(students.search('220', limit=100)) == 10
+    assert students.search('220', limit=0) == []
+    assert len(students.search('220')) == 10
+
+def test_search_follows_changes():
+    students = StudentList([student(22001, '강산원')])
+    assert students.search('ㄱ') == [students['강산원']]  # 색인을 미리 만들어 둠
+
+    students.append(student(22002, '곽민'))
+    assert [e.id for e in students.search('ㄱ')] == [22002, 22001]
+
+    students.extend([student(22003, '구름'), student(22004, '나래')])
+    assert [e.id for e in students.search('ㄱ')] == [22003, 22002, 22001]
+    assert [e.id for e in students.search('ㄴ')] == [22004]
+
+    students['곽민'] = student(22002, '도윤')
+    assert [e.id for e in students.search('ㄱ')] == [22003, 22001]
+    assert [e.name for e in students.search('ㄷ')] == ['도윤']
+    assert students.search('곽') == []
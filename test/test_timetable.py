@@ -0,0 +1,83 @@
+import pytest
+
+from src.timetable import *
+
+def test_slice_reads_parent_cells(make_classes):
+    pool = ClassPool()
+    math, physics = make_classes(pool)
+
+    timetable = Timetable(pool=pool)
+    timetable['월', 1] = math
+    timetable['화', 3] = physics
+
+    assert timetable['월'][1].value() is math
+    assert timetable[3]['화'].value() is physics
+    assert timetable['월':'수'][3]['화'].value() is physics
+    assert timetable['월'][2].value() is GAP
+    assert dict(timetable['월'].items(remove_gap=True)) == {(Week.MON, 1): math}
+
+def test_writing_to_slice_does_not_touch_parent(make_classes):
+    pool = ClassPool()
+    math, physics = make_classes(pool)
+
+    timetable = Timetable(pool=pool)
+    timetable['월', 1] = math
+    monday = timetable['월']
+
+    monday['월', 2] = physics
+
+    assert monday[2].value() is physics
+    assert timetable['월'][2].value() is GAP
+    assert timetable['월'][1].value() is math
+
+def test_writing_to_parent_does_not_touch_slice(make_classes):
+    pool = ClassPool()
+    math, physics = make_classes(pool)
+
+    timetable = Timetable(pool=pool)
+    timetable['월', 1] = math
+    monday = timetable['월']
+    first = timetable[1]
+
+    timetable['월', 1] = physics
+
+    assert timetable['월'][1].value() is physics
+    assert monday[1].value() is math
+    assert first['월'].value() is math
+
+def test_slices_of_slices_stay_independent(make_classes):
+    pool = ClassPool()
+    math, physics = make_classes(pool)
+
+    timetable = Timetable(pool=pool)
+    timetable['수', 4] = math
+    wednesday = timetable['수']
+    fourth = wednesday[4]
+
+    wednesday['수', 4] = physics
+
+    assert fourth.value() is math
+    assert timetable['수'][4].value() is math
+    assert wednesday[4].value() is physics
+
+def test_equality_across_pools(make_classes):
+    pool, other_pool = ClassPool(), ClassPool()
+    math, _ = make_classes(pool)
+    other_math, _ = make_classes(other_pool)
+
+    timetable = Timetable(pool=pool)
+    timetable['금', 5] = math
+    other = Timetable(pool=other_pool)
+    other['금', 5] = other_math
+
+    assert timetable == other
+    assert timetable['금'] == other['금']
+
+    other['금', 6] = other_math
+    assert timetable != other
+
+def test_out_of_range_cell_raises():
+    timetable = Timetable(pool=ClassPool())
+
+    with pytest.raises(KeyError):
+        timetable['월'][max_period + 1].value()